@@ -1,5 +1,6 @@
 # plsql_analyzer/orchestration/extraction_workflow.py
 from __future__ import annotations
+import os
 from pathlib import Path
 from tqdm.auto import tqdm
 import loguru as lg # Expect logger
@@ -46,7 +47,8 @@ class ExtractionWorkflow:
         self.total_objects_failed_db_add = 0
         self.total_files_force_reprocessed = 0
 
-    def _process_single_file(self, fpath: Path):
+    def _process_single_file(self, fpath: Path | str):
+        fpath = Path(fpath)
         self.logger.info(f"Processing File: {self.file_helpers.escape_angle_brackets(str(fpath))}")
         
         processed_fpath = self.file_helpers.get_processed_fpath(
@@ -79,8 +81,8 @@ class ExtractionWorkflow:
             with open(fpath, 'r', encoding='utf-8', errors='ignore') as f:
                 code_content = f.read()
             
-            # Clean the code 
-            clean_code, literal_map = clean_code_and_map_literals(code_content, self.logger)
+            # Clean the code. Each file is cleaned once, so it skips the cleaning cache
+            clean_code, literal_map = clean_code_and_map_literals(code_content, self.logger, use_cache=False)
             code_lines = clean_code.splitlines() # Keep for extracting source snippets
         except Exception as e:
             self.logger.error(f"Failed to read file {fpath}: {escape_angle_brackets(e)}")
@@ -249,28 +251,30 @@ class ExtractionWorkflow:
             self.logger.critical(f"Source code directory does not exist or is not a directory: {source_folder}")
             return
 
-        # Using rglob to find all files matching the extension recursively
-        files_to_process = []
-        for extension in self.config.file_extensions_to_include:
-            self.logger.info(f"Searching for files with extension: {extension}")
-            # Using rglob to find all files matching the extension recursively
-            files_to_process.extend(list(source_folder.rglob(f"*.{extension}")))
+        # Single os.scandir based walk for all extensions; paths stay strings until processed
+        self.logger.info(f"Searching for files with extensions: {self.config.file_extensions_to_include}")
+        files_to_process = list(self.file_helpers.walk_source_tree(source_folder, self.config.file_extensions_to_include))
 
         if not files_to_process:
             self.logger.warning("No files found to process. Exiting workflow.")
             return
 
-        # Progress bar for files
-        file_pbar = tqdm(files_to_process, desc="Overall File Progress", unit="file", leave=True)
-        for fpath in file_pbar:
-            file_pbar.set_postfix_str("\\".join(fpath.parts[-3:]), refresh=True)
-            try:
-                self._process_single_file(fpath)
-            except Exception as e:
-                # Catch any unexpected errors at the file level to prevent workflow halt
-                self.logger.error(f"Unhandled exception while processing file {fpath}. Skipping this file.")
-                self.logger.exception(e)
-                break
+        # Group the per-file DB writes into larger transactions to avoid a commit per file/object
+        self.db_manager.begin_batch()
+        try:
+            # Progress bar for files
+            file_pbar = tqdm(files_to_process, desc="Overall File Progress", unit="file", leave=True)
+            for fpath in file_pbar:
+                file_pbar.set_postfix_str("\\".join(fpath.split(os.sep)[-3:]), refresh=True)
+                try:
+                    self._process_single_file(fpath)
+                except Exception as e:
+                    # Catch any unexpected errors at the file level to prevent workflow halt
+                    self.logger.error(f"Unhandled exception while processing file {fpath}. Skipping this file.")
+                    self.logger.exception(e)
+                    break
+        finally:
+            self.db_manager.commit_batch()
         
         self.logger.info("PL/SQL Extraction Workflow Finished.")
         self.log_summary()
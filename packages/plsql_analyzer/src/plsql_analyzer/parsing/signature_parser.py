@@ -1,9 +1,11 @@
 # plsql_analyzer/parsing/signature_parser.py
 from __future__ import annotations
+import re
 import json
 import loguru as lg
 import pyparsing as pp # Ensure pyparsing is installed: pip install pyparsing
 
+from functools import lru_cache
 from typing import Dict, Optional
 from plsql_analyzer.utils.text_utils import escape_angle_brackets
 
@@ -11,149 +13,159 @@ from plsql_analyzer.utils.text_utils import escape_angle_brackets
 pp.ParserElement.enablePackrat()
 pp.ParserElement.setDefaultWhitespaceChars(" \t\r\n")
 
+# Every signature the grammar accepts contains one of these keywords, so text without them
+# can be rejected before running pyparsing at all.
+_SIGNATURE_KEYWORD_REGEX = re.compile(r"PROCEDURE|FUNCTION", re.IGNORECASE)
+
+
+def _process_parameter(s: str, loc: int, toks: pp.ParseResults) -> Dict[str, str|bool]:
+    # Parse action of the shared grammar, so it has no logger; `PLSQLSignatureParser.parse` traces the results.
+    # toks[0] is the Group containing parameter details
+    p_dict = toks[0].as_dict()
+
+    raw_mode = p_dict.get("param_mode_raw")
+    mode = "IN" # Default
+    if isinstance(raw_mode, str): # "IN" or "OUT"
+        mode = raw_mode.upper()
+    elif isinstance(raw_mode, pp.ParseResults) and len(raw_mode) > 0 : # Could be "IN OUT"
+        # raw_mode might be a list like ['IN', 'OUT'] or just ['IN']
+        # Combine will make it a single string "IN OUT"
+        mode = " ".join(raw_mode).upper()
+    
+    param_info = {
+        "name": p_dict["param_name"].strip(),
+        "type": p_dict["param_type"].strip(), # type might have spaces, e.g. "VARCHAR2 (100)"
+        "mode": mode.strip(),
+        "default_value": p_dict.get("default_value", "").strip() or None, # Ensure empty string becomes None
+        # "has_nocopy": "has_nocopy" in p_dict # True if NOCOPY was present
+    }
+    return param_info
+
+@lru_cache(maxsize=1)
+def _build_signature_grammar() -> pp.ParserElement:
+    """
+    Builds the procedure/function signature grammar. The grammar holds no per-parser state,
+    so it is built once per process and shared by every `PLSQLSignatureParser`.
+    """
+    # Basic Keywords
+    CREATE, OR, REPLACE, EDITIONABLE, NONEDITIONABLE, PROCEDURE, FUNCTION, IS, AS, RETURN, IN, OUT, DEFAULT, NOCOPY = map(
+        pp.CaselessKeyword,
+        "CREATE OR REPLACE EDITIONABLE NONEDITIONABLE PROCEDURE FUNCTION IS AS RETURN IN OUT DEFAULT NOCOPY".split()
+    )
+
+    # Delimiters and Operators (suppressed from output)
+    LPAR, RPAR, COMMA, SEMI, PLUS = map(pp.Suppress, "(),;+")
+    ASSIGN = pp.Suppress(":=")
+    # DOT for qualified identifiers needs to be a Literal, not Suppress, if part of combine=True
+    DOT = pp.Literal('.')
+
+    # Identifiers
+    # Allowing dot in identifier for schema.name, but qualified_identifier handles it better.
+    # Added '#' and '$' commonly found in Oracle identifiers.
+    identifier = pp.Word(pp.alphas + "_", pp.alphanums + "_#$") | pp.QuotedString('"', esc_char='""', unquote_results=False)
+
+    # Qualified identifier: schema.package.name or package.name or name
+    # combine=True makes it a single string
+    qualified_identifier = pp.DelimitedList(identifier, delim=DOT, combine=True)
+
+    # Parameter Mode
+    # Order Matters: Check "IN OUT" first
+    param_mode = pp.Combine(IN + OUT, adjacent=False, join_string=" ")  | IN | OUT 
+
+    # Parameter Type attribute
+    type_attribute = pp.CaselessLiteral("%TYPE") | pp.CaselessLiteral("%ROWTYPE")
+
+    # Parameter Type: identifier optionally with type_attribute or (value) for size like VARCHAR2(100)
+    # This needs to be more robust to capture things like "VARCHAR2 (2000 BYTE)" or "TABLE OF some_type"
+    # Using originalTextFor to capture complex types as a single string
+    # A simple approach: anything until the next keyword (DEFAULT, NOCOPY, COMMA, RPAR)
+    # This might be too greedy. Let's try a more defined one.
+
+    # Basic types, qualified types, types with attributes
+    # A general type expression can be complex, e.g. `pkg.type%ROWTYPE` or `TABLE OF another.type`
+    # `pp.SkipTo` is often useful for complex, less-structured parts.
+    # However, for types, they are somewhat structured.
+
+    # For param_type, let's try to capture common patterns:
+    # 1. simple_type (e.g., VARCHAR2, NUMBER, DATE)
+    # 2. qualified_type (e.g., schema.table.column%TYPE, pkg.custom_type)
+    # 3. type_with_size (e.g., VARCHAR2(100), NUMBER(10,2))
+    # 4. collection_type (e.g., TABLE OF some_type, VARRAY(10) OF other_type) - More complex
+
+    # Let's use a simpler combined approach for now and refine if needed.
+    # `Combine` is good for piecing together parts that should be one token.
+    param_type_base = qualified_identifier.copy()
+    param_type_with_attr = pp.Combine(param_type_base + type_attribute)
+    # For types like VARCHAR2(100) or NUMBER(5,0)
+    # Need to capture content within parentheses that isn't a parameter list.
+    # Regex for typical size/precision specifier
+    size_specifier = pp.Regex(r"\(\s*\d+(\s*,\s*\d+)?\s*(?:CHAR|BYTE)?\s*\)")
+    param_type_with_size = pp.Combine(param_type_base + pp.Optional(size_specifier), adjacent=False, join_string="")
+
+    # Final param_type, order matters for matching
+    param_type = pp.original_text_for(param_type_with_attr | param_type_with_size | param_type_base | pp.Combine(qualified_identifier + pp.Optional(LPAR + PLUS + RPAR) + pp.Optional(type_attribute)))
+
+    # Default Value Expression: Capture everything until the next comma or closing parenthesis
+    # original_text_for is good here as default values can be complex expressions
+    default_value_expr = pp.original_text_for(pp.SkipTo(COMMA | RPAR))
+    default_clause = (DEFAULT | ASSIGN) + default_value_expr("default_value")
+
+    # Single Parameter structure
+    parameter = pp.Group(
+        identifier("param_name") +
+        pp.Optional(param_mode)("param_mode_raw") + # Captures mode like "IN" or ["IN","OUT"]
+        pp.Optional(NOCOPY)("has_nocopy") + # Presence indicates true
+        param_type("param_type") +
+        pp.Optional(default_clause)
+    )
+    parameter.set_parse_action(_process_parameter)
+
+    # Optional: Parameter list
+    parameter_list = pp.Optional(LPAR + pp.delimited_list(parameter)("params") + RPAR)
+
+    # Procedure header
+    # Optional "CREATE OR REPLACE [EDITIONABLE|NONEDITIONABLE]" prefix
+    optional_create_prefix = pp.Optional(
+        CREATE + pp.Optional(OR + REPLACE) + pp.Optional(EDITIONABLE | NONEDITIONABLE)
+    )
+    proc_header = (
+        optional_create_prefix +
+        PROCEDURE + qualified_identifier("proc_name") +
+        parameter_list +
+        pp.Optional(IS | AS) # End of signature before body
+    )
+
+    # Function Header
+    # Return type for function is similar to param_type
+    return_type_spec = param_type.copy() # Reuse param_type definition
+    return_clause = RETURN + return_type_spec("return_type")
+
+    func_header = (
+        optional_create_prefix +
+        FUNCTION + qualified_identifier("func_name") +
+        parameter_list +
+        return_clause + # RETURN clause is mandatory for function syntax after params
+        pp.Optional(IS | AS) # End of signature before body
+    )
+
+    # Combined parser for either a procedure or a function signature
+    # We are interested in parsing the signature part, so we don't need the full body.
+    # The input to this parser should ideally be just the signature line(s).
+    # Adding Optional(SEMI) to consume a trailing semicolon if the signature is extracted standalone.
+    proc_or_func_signature = (proc_header | func_header) + pp.Optional(SEMI)
+    # Enable packrat for the signature grammar (once, since the grammar itself is built once)
+    proc_or_func_signature.enable_packrat(cache_size_limit=1024, force=True)
+    return proc_or_func_signature
+
 
 class PLSQLSignatureParser:
     def __init__(self, logger: lg.Logger):
         self.logger = logger.bind(parser_type="Signature")
-        self._setup_pyparsing_parser()
-        # Enable packrat for the instance of the parser
-        self.proc_or_func_signature.enable_packrat(cache_size_limit=1024, force=True)
+        self.proc_or_func_signature = _build_signature_grammar()
 
     # _escape_angle_brackets method has been removed and replaced with
     # the centralized version from utils.text_utils
 
-    def _process_parameter(self, s: str, loc: int, toks: pp.ParseResults) -> Dict[str, str|bool]:
-        # toks[0] is the Group containing parameter details
-        p_dict = toks[0].as_dict()
-        self.logger.trace(f"Raw param toks: {escape_angle_brackets(p_dict)}")
-
-        raw_mode = p_dict.get("param_mode_raw")
-        mode = "IN" # Default
-        if isinstance(raw_mode, str): # "IN" or "OUT"
-            mode = raw_mode.upper()
-        elif isinstance(raw_mode, pp.ParseResults) and len(raw_mode) > 0 : # Could be "IN OUT"
-            # raw_mode might be a list like ['IN', 'OUT'] or just ['IN']
-            # Combine will make it a single string "IN OUT"
-            mode = " ".join(raw_mode).upper()
-        
-        param_info = {
-            "name": p_dict["param_name"].strip(),
-            "type": p_dict["param_type"].strip(), # type might have spaces, e.g. "VARCHAR2 (100)"
-            "mode": mode.strip(),
-            "default_value": p_dict.get("default_value", "").strip() or None, # Ensure empty string becomes None
-            # "has_nocopy": "has_nocopy" in p_dict # True if NOCOPY was present
-        }
-        self.logger.trace(f"Processed param: {escape_angle_brackets(param_info)}")
-        return param_info
-
-    def _setup_pyparsing_parser(self):
-        # Basic Keywords
-        CREATE, OR, REPLACE, EDITIONABLE, NONEDITIONABLE, PROCEDURE, FUNCTION, IS, AS, RETURN, IN, OUT, DEFAULT, NOCOPY = map(
-            pp.CaselessKeyword,
-            "CREATE OR REPLACE EDITIONABLE NONEDITIONABLE PROCEDURE FUNCTION IS AS RETURN IN OUT DEFAULT NOCOPY".split()
-        )
-
-        # Delimiters and Operators (suppressed from output)
-        LPAR, RPAR, COMMA, SEMI, PLUS = map(pp.Suppress, "(),;+")
-        ASSIGN = pp.Suppress(":=")
-        # DOT for qualified identifiers needs to be a Literal, not Suppress, if part of combine=True
-        DOT = pp.Literal('.')
-
-        # Identifiers
-        # Allowing dot in identifier for schema.name, but qualified_identifier handles it better.
-        # Added '#' and '$' commonly found in Oracle identifiers.
-        identifier = pp.Word(pp.alphas + "_", pp.alphanums + "_#$") | pp.QuotedString('"', esc_char='""', unquote_results=False)
-        
-        # Qualified identifier: schema.package.name or package.name or name
-        # combine=True makes it a single string
-        qualified_identifier = pp.DelimitedList(identifier, delim=DOT, combine=True)
-
-        # Parameter Mode
-        # Order Matters: Check "IN OUT" first
-        param_mode = pp.Combine(IN + OUT, adjacent=False, join_string=" ")  | IN | OUT 
-
-        # Parameter Type attribute
-        type_attribute = pp.CaselessLiteral("%TYPE") | pp.CaselessLiteral("%ROWTYPE")
-
-        # Parameter Type: identifier optionally with type_attribute or (value) for size like VARCHAR2(100)
-        # This needs to be more robust to capture things like "VARCHAR2 (2000 BYTE)" or "TABLE OF some_type"
-        # Using originalTextFor to capture complex types as a single string
-        # A simple approach: anything until the next keyword (DEFAULT, NOCOPY, COMMA, RPAR)
-        # This might be too greedy. Let's try a more defined one.
-        
-        # Basic types, qualified types, types with attributes
-        # A general type expression can be complex, e.g. `pkg.type%ROWTYPE` or `TABLE OF another.type`
-        # `pp.SkipTo` is often useful for complex, less-structured parts.
-        # However, for types, they are somewhat structured.
-        
-        # For param_type, let's try to capture common patterns:
-        # 1. simple_type (e.g., VARCHAR2, NUMBER, DATE)
-        # 2. qualified_type (e.g., schema.table.column%TYPE, pkg.custom_type)
-        # 3. type_with_size (e.g., VARCHAR2(100), NUMBER(10,2))
-        # 4. collection_type (e.g., TABLE OF some_type, VARRAY(10) OF other_type) - More complex
-
-        # Let's use a simpler combined approach for now and refine if needed.
-        # `Combine` is good for piecing together parts that should be one token.
-        param_type_base = qualified_identifier.copy()
-        param_type_with_attr = pp.Combine(param_type_base + type_attribute)
-        # For types like VARCHAR2(100) or NUMBER(5,0)
-        # Need to capture content within parentheses that isn't a parameter list.
-        # Regex for typical size/precision specifier
-        size_specifier = pp.Regex(r"\(\s*\d+(\s*,\s*\d+)?\s*(?:CHAR|BYTE)?\s*\)")
-        param_type_with_size = pp.Combine(param_type_base + pp.Optional(size_specifier), adjacent=False, join_string="")
-
-        # Final param_type, order matters for matching
-        param_type = pp.original_text_for(param_type_with_attr | param_type_with_size | param_type_base | pp.Combine(qualified_identifier + pp.Optional(LPAR + PLUS + RPAR) + pp.Optional(type_attribute)))
-
-        # Default Value Expression: Capture everything until the next comma or closing parenthesis
-        # original_text_for is good here as default values can be complex expressions
-        default_value_expr = pp.original_text_for(pp.SkipTo(COMMA | RPAR))
-        default_clause = (DEFAULT | ASSIGN) + default_value_expr("default_value")
-
-        # Single Parameter structure
-        parameter = pp.Group(
-            identifier("param_name") +
-            pp.Optional(param_mode)("param_mode_raw") + # Captures mode like "IN" or ["IN","OUT"]
-            pp.Optional(NOCOPY)("has_nocopy") + # Presence indicates true
-            param_type("param_type") +
-            pp.Optional(default_clause)
-        )
-        parameter.set_parse_action(self._process_parameter)
-
-        # Optional: Parameter list
-        parameter_list = pp.Optional(LPAR + pp.delimited_list(parameter)("params") + RPAR)
-
-        # Procedure header
-        # Optional "CREATE OR REPLACE [EDITIONABLE|NONEDITIONABLE]" prefix
-        optional_create_prefix = pp.Optional(
-            CREATE + pp.Optional(OR + REPLACE) + pp.Optional(EDITIONABLE | NONEDITIONABLE)
-        )
-        proc_header = (
-            optional_create_prefix +
-            PROCEDURE + qualified_identifier("proc_name") +
-            parameter_list +
-            pp.Optional(IS | AS) # End of signature before body
-        )
-
-        # Function Header
-        # Return type for function is similar to param_type
-        return_type_spec = param_type.copy() # Reuse param_type definition
-        return_clause = RETURN + return_type_spec("return_type")
-        
-        func_header = (
-            optional_create_prefix +
-            FUNCTION + qualified_identifier("func_name") +
-            parameter_list +
-            return_clause + # RETURN clause is mandatory for function syntax after params
-            pp.Optional(IS | AS) # End of signature before body
-        )
-
-        # Combined parser for either a procedure or a function signature
-        # We are interested in parsing the signature part, so we don't need the full body.
-        # The input to this parser should ideally be just the signature line(s).
-        # Adding Optional(SEMI) to consume a trailing semicolon if the signature is extracted standalone.
-        self.proc_or_func_signature = (proc_header | func_header) + pp.Optional(SEMI)
-
     def _clean_code_for_signature_v1(self, signature_text: str) -> str:
         # Remove C-style comments /* ... */ and SQL-style -- comments
         # Pyparsing's built-in comment definitions are good.
@@ -234,6 +246,10 @@ class PLSQLSignatureParser:
             self.logger.warning("Attempted to parse an empty signature string.")
             return None
 
+        if not _SIGNATURE_KEYWORD_REGEX.search(signature_text):
+            self.logger.warning(f"No PL/SQL signature found or matched in the provided text: {escape_angle_brackets(signature_text[:200])}...")
+            return None
+
         # The structural parser might give us more than just the signature line.
         # We need to find the core signature. A simple heuristic:
         # Take up to " IS " or " AS " or the first semicolon.
@@ -298,6 +314,9 @@ class PLSQLSignatureParser:
                     # Note: 'params' is handled separately as it's a list of dicts
                     # The stripping for param details happens in _process_parameter
 
+                for param_info in parsed_dict.get("params", []):
+                    self.logger.trace(f"Processed param: {escape_angle_brackets(param_info)}")
+
                 self.logger.debug(f"Successfully parsed signature. Name: {escape_angle_brackets(parsed_dict.get('proc_name') or parsed_dict.get('func_name'))}, Param: {escape_angle_brackets(json.dumps(parsed_dict.get('params', {}), indent=0))}")
                 # Ensure 'params' is always a list, even if empty
                 if "params" not in parsed_dict:
@@ -1,6 +1,8 @@
 # plsql_analyzer/parsing/structural_parser.py
 from __future__ import annotations
 import re
+import sys
+from itertools import accumulate
 from pprint import pformat
 import loguru as lg # Assuming logger is passed
 from typing import List, Tuple, Optional, Dict, Any
@@ -38,7 +40,7 @@ OBJECT_NAME_REGEX = re.compile(
                                                     #   [^\S\n]* : Matches zero or more whitespace characters that are NOT newlines.
                                                     #   \n : Matches a newline character.
             """,
-    flags= re.IGNORECASE | re.VERBOSE
+    flags= re.IGNORECASE | re.VERBOSE | re.ASCII
 )
 
 PACKAGE_NAME_REGEX = re.compile(r"""
@@ -70,7 +72,7 @@ PACKAGE_NAME_REGEX = re.compile(r"""
     (?:IS|AS)?                              # Optionally matches the keyword "IS" or "AS" (non-capturing group).
                                             #   (?: ... )? makes the group optional.
                                             #   IS|AS matches either "IS" or "AS".
-    """, re.IGNORECASE | re.VERBOSE
+    """, re.IGNORECASE | re.VERBOSE | re.ASCII
 )
 
 END_CHECK_REGEX = re.compile(r"""
@@ -78,7 +80,7 @@ END_CHECK_REGEX = re.compile(r"""
     (END)   # Capturing group 1: Matches the literal string "END".
     \b      # Matches another word boundary.
     """,
-    flags=re.IGNORECASE | re.VERBOSE
+    flags=re.IGNORECASE | re.VERBOSE | re.ASCII
 )
 
 KEYWORDS_REQUIRING_END = [x.casefold() for x in ["IF", "LOOP", "FOR", "WHILE", "BEGIN", "CASE"]]
@@ -95,7 +97,7 @@ KEYWORDS_REQUIRING_END_REGEX = re.compile(rf"""
     )                       # End of capturing group 1.
     \b                      # Matches a word boundary after the keyword.
     """,
-    flags=re.IGNORECASE | re.VERBOSE # Added re.VERBOSE for consistency with multi-line format
+    flags=re.IGNORECASE | re.VERBOSE | re.ASCII # Added re.VERBOSE for consistency with multi-line format
 )
 
 # Dynamically constructs a regex string for identifying single-line blocks
@@ -117,16 +119,82 @@ KEYWORDS_REQUIRING_END_ONE_LINE_REGEX =  re.compile(rf"""
                                 # This accounts for any code between THEN (if present) and the final END.
     \bEND\b                     # Matches the keyword "END" as a whole word, signifying the end of the one-line block.
     """,
-    flags=re.IGNORECASE | re.VERBOSE # Added re.VERBOSE
+    flags=re.IGNORECASE | re.VERBOSE | re.ASCII # Added re.VERBOSE
 )
 
+# Single-pass scan for both END and the block keywords: group 1 is END, group 2 a keyword requiring END.
+# END and the keywords are distinct whole words, so one scan finds exactly the matches of
+# END_CHECK_REGEX and KEYWORDS_REQUIRING_END_REGEX together, in line order.
+BLOCK_KEYWORD_OR_END_REGEX = re.compile(rf"""
+    \b
+    (?:
+        (END)                                   # Group 1: END
+        |
+        (?<!END\s)                              # Group 2: keyword not part of an "END <KEYWORD>" construct
+        ({'|'.join(KEYWORDS_REQUIRING_END)})
+    )
+    \b
+    """,
+    flags=re.IGNORECASE | re.VERBOSE | re.ASCII
+)
+
+# Fixed patterns used while walking lines (compiled once here instead of per call).
+# PL/SQL keywords and the identifier characters matched here are ASCII, so all patterns use re.ASCII
+# for cheaper \b, \s and case-insensitive matching.
+RETURN_CLAUSE_REGEX = re.compile(r"\bRETURN\b\s+(.*?)\s*;", re.IGNORECASE | re.ASCII)
+OBJECT_KEYWORD_AT_LINE_END_REGEX = re.compile(r"\b(FUNCTION|PROCEDURE)\s*$", re.IGNORECASE | re.ASCII)
+# `FOR UPDATE` and `OPEN cursor FOR query` use FOR without starting a loop
+NON_LOOP_FOR_REGEX = re.compile(r"\bFOR\s+UPDATE\b|\bOPEN\s+\S+\s+FOR\b", re.IGNORECASE | re.ASCII)
+FOR_LOOP_ONE_LINE_REGEX = re.compile(r"\bFOR\b.*\bLOOP\b", re.IGNORECASE | re.ASCII)
+WHILE_LOOP_ONE_LINE_REGEX = re.compile(r"\bWHILE\b.*\bLOOP\b", re.IGNORECASE | re.ASCII)
+
+# Quoted literals and inline comments, for _remove_strings_and_inline_comments. `''` inside a literal
+# is an escaped quote; the possessive `*+` keeps the engine from backtracking into such a pair.
+# Substituting r"\1\2" keeps just a literal's own quotes and drops comments entirely.
+STRING_OR_INLINE_COMMENT_REGEX = re.compile(r"""
+    --.*                    # Inline comment: drops the rest of the line
+    | (')(?:[^']|'')*+(')?  # Literal; without a closing quote it runs to the end of the line
+    """,
+    flags=re.VERBOSE | re.DOTALL
+)
+# The tail of a literal carried over from the previous line, up to its closing quote
+QUOTE_CONTINUATION_REGEX = re.compile(r"(?:[^']|'')*+'")
+
+# Interned upper-case spellings of the block/scope keywords, looked up by either their
+# casefolded or upper-case form, so the entries pushed onto block_stack/scope_stack are
+# shared objects and comparisons against them short-circuit on identity.
+_CANONICAL_KEYWORDS = {
+    form: kw
+    for kw in map(sys.intern, ("IF", "LOOP", "FOR", "WHILE", "BEGIN", "CASE", "END", "PACKAGE", "PROCEDURE", "FUNCTION"))
+    for form in (kw, kw.casefold())
+}
+
+def _canonical_keyword(keyword:str) -> str:
+    """Returns the interned upper-case form of a block/scope keyword (or its plain upper-case form)."""
+    return _CANONICAL_KEYWORDS.get(keyword) or keyword.upper()
+
 class PlSqlStructuralParser:
-    
+
+    # Fixed attribute set: no per-instance __dict__, and slot loads in the per-line hot path
+    __slots__ = (
+        "logger", "verbose_lvl",
+        "code", "lines", "line_start_offsets",
+        "line_num", "current_line_content", "processed_line_content",
+        "inside_quote", "inside_multiline_comment", "multiline_object_name_pending",
+        "package_name", "collected_code_objects",
+        "block_stack", "scope_stack",
+        "is_awaiting_loop_for_for", "is_awaiting_loop_for_while",
+        "forward_decl_candidate", "forward_decl_check_end_line", "is_forward_decl",
+    )
+
     def __init__(self, logger:lg.Logger, verbose_lvl:int):
 
         self.logger = logger.bind(parser_type="Structural")
         self.verbose_lvl = verbose_lvl
 
+        # Source being parsed (set by _load_code)
+        self._load_code("")
+
         # Parsing State (initialized in reset_state)
         self.line_num = 0
         self.current_line_content = ""
@@ -152,13 +220,13 @@ class PlSqlStructuralParser:
         # State for forward declaration detection
         self.forward_decl_candidate: Optional[Tuple[int, Tuple[str, str]]] = None # (scope_line, (type, name))
         self.forward_decl_check_end_line: Optional[int] = None # Line where check was triggered
+        self.is_forward_decl = False
 
-        # self.reset_state() # Initialize state
+        # self.reset_state() # Initialize state - the defaults above already match it
 
     def reset_state(self):
         """Resets the parser state for a new run or initialization."""
-        self.code = ""
-        self.lines = self.code.splitlines(keepends=True)
+        self._load_code("")
         self.line_num = 0
         self.current_line_content = ""
         self.processed_line_content = ""
@@ -177,54 +245,36 @@ class PlSqlStructuralParser:
         self.logger.trace("StructuralParser state reset.")
 
     def _remove_strings_and_inline_comments(self, line: str, current_inside_quote_state: bool) -> Tuple[str, bool]:
-        new_line = ""
-        idx = 0
-        # Propagate quote state from previous line
-        is_inside_quote = current_inside_quote_state 
-
-        while idx < len(line):
-            current_char = line[idx]
-            next_char = line[idx + 1] if (idx + 1) < len(line) else None
-
-            if is_inside_quote:
-
-                # Check for escaped quote
-                if next_char and current_char + next_char == "''":
-                    # new_line += "''"
-                    idx += 1
-                
-                # Close Quotes
-                elif current_char == "'" and next_char != "'":
-                    new_line += current_char
-                    is_inside_quote = False
-                
-                # Else - Just skip over
-            
-            # If not inside quotes
-            else:
+        # Keeps the quote characters but drops quoted text, and cuts the line at an inline `--` comment.
+        # One STRING_OR_INLINE_COMMENT_REGEX pass rewrites every literal and comment on the line.
+        prefix = ""
 
-                # Check start of quotes
-                if current_char == "'":
-                    new_line += current_char
-                    is_inside_quote = True
-                
-                # Check for inline comments
-                elif next_char and current_char + next_char == "--":
-                    break
+        # Propagate quote state from previous line
+        if current_inside_quote_state:
+            continuation = QUOTE_CONTINUATION_REGEX.match(line)
 
-                else:
-                    new_line += current_char
-            
-            idx += 1
+            # Quote runs past the end of the line - nothing on it is code
+            if continuation is None:
+                return "", True
 
+            # Close Quotes
+            prefix = "'"
+            line = line[continuation.end():]
 
+        # Most lines hold neither - skip the regex pass
+        if "'" not in line and "--" not in line:
+            return prefix + line, False
 
-        return new_line, is_inside_quote
+        # Code outside literals holds no quotes, so the remainder has an odd number of quotes
+        # exactly when its last literal is still open
+        processed_line = STRING_OR_INLINE_COMMENT_REGEX.sub(r"\1\2", line)
+        return prefix + processed_line, processed_line.count("'") % 2 == 1
 
     def _push_scope(self, line_num: int, scope_type: str, scope_name: str, is_package: bool = False):
         """Pushes a new scope (Package, Procedure, Function) onto the stack."""
         scope_name_cleaned = scope_name.replace("\"", "") # Remove quotes for internal tracking
-        scope_tuple = (scope_type.upper(), scope_name_cleaned)
+        scope_type = _canonical_keyword(scope_type)
+        scope_tuple = (scope_type, scope_name_cleaned)
         state_info = {"has_seen_begin": False, "is_package": is_package}
 
         self.scope_stack.append((line_num, scope_tuple, state_info))
@@ -237,11 +287,14 @@ class PlSqlStructuralParser:
             if obj_key not in self.collected_code_objects:
                 self.collected_code_objects[obj_key] = []
 
-            self.collected_code_objects[obj_key].append({
+            code_object = {
                 "start": line_num,
                 "end": -1, # Placeholder
-                "type": scope_type.upper()
-            })
+                "type": scope_type
+            }
+            self.collected_code_objects[obj_key].append(code_object)
+            # Keep the entry on the scope so its END can set the end line without searching for it
+            state_info["code_object"] = code_object
 
             # Prepare for potential forward declaration check ONLY for PROC/FUNC
             # self.forward_decl_candidate = (line_num, scope_tuple)
@@ -253,8 +306,9 @@ class PlSqlStructuralParser:
 
     def _push_block(self, line_num: int, block_type: str):
         """Pushes a block keyword (IF, LOOP, etc.) onto the stack."""
-        self.block_stack.append((line_num, block_type.upper()))
-        self.logger.debug(f"L{line_num}: PUSH BLOCK: {block_type.upper()}")
+        block_type = _canonical_keyword(block_type)
+        self.block_stack.append((line_num, block_type))
+        self.logger.debug(f"L{line_num}: PUSH BLOCK: {block_type}")
 
     def _pop_scope(self, reason:str) -> Tuple[int, Tuple[str, str], Dict[str, Any]]:
         """Pops the current scope from the stack."""
@@ -285,6 +339,20 @@ class PlSqlStructuralParser:
         
         return popped
 
+    def _load_code(self, code:str):
+        """Splits `code` into lines once and records the offset at which each line starts."""
+        self.code = code
+        self.lines = code.splitlines(keepends=True)
+        # line_start_offsets[i] is where line i+1 starts; the final entry is len(code)
+        self.line_start_offsets = list(accumulate(map(len, self.lines), initial=0))
+
+    def _code_since_line(self, start_line:int) -> str:
+        """Returns the source text from `start_line` up to and including the current line."""
+        last = len(self.lines)
+        start = self.line_start_offsets[min(max(start_line-1, 0), last)]
+        end = self.line_start_offsets[min(max(self.line_num, 0), last)]
+        return self.code[start:end]
+
     def _check_for_forward_decl_candidate(self, processed_line:str, scope_line:int, scope_type:str, scope_name:str):
         # scope_line, (scope_type, scope_name) = self.forward_decl_candidate
         self.logger.trace(f"L{scope_line}: Checking Candidate for Forward Decl: {(scope_type, scope_name)}")
@@ -293,7 +361,7 @@ class PlSqlStructuralParser:
         if scope_type == "PROCEDURE":
             # Check code block since definition for more complex patterns if needed
             # (Simplified check here based on original logic)
-            code_block_since_def = "".join(self.lines[scope_line-1 : self.line_num])
+            code_block_since_def = self._code_since_line(scope_line)
             self.logger.trace(f"L{scope_line}-{self.line_num}: Code Block from Def: `{escape_angle_brackets(repr(code_block_since_def.strip()))}`")
 
             if re.search(rf"PROCEDURE\s+{scope_name.replace('.', r'\.')}\s*\(((?!(\bIS\b|\bAS\b)).)*;", code_block_since_def, re.DOTALL|re.IGNORECASE):
@@ -310,12 +378,12 @@ class PlSqlStructuralParser:
         
         # Pattern 3: Function return clause ending with semicolon
         if scope_type == "FUNCTION":
-            code_block_since_def = "".join(self.lines[scope_line-1 : self.line_num])
+            code_block_since_def = self._code_since_line(scope_line)
             self.logger.trace(f"L{scope_line}-{self.line_num}: Code Block from Def: `{escape_angle_brackets(repr(code_block_since_def.strip()))}`")
             # Check if RETURN type is defined and line ends with ;
             # if re.search(rf"FUNCTION\s+{re.escape(scope_name)}.*?\s*\bRETURN\b\s+\S+\s*;", code_block_since_def, re.IGNORECASE|re.DOTALL):
             #     self.is_forward_decl = True
-            if re.search(r"\bRETURN\b\s+(.*?)\s*;", processed_line, re.IGNORECASE):
+            if RETURN_CLAUSE_REGEX.search(processed_line):
                 self.forward_decl_candidate = (scope_line, (scope_type, scope_name))
 
         if self.forward_decl_candidate:
@@ -377,12 +445,14 @@ class PlSqlStructuralParser:
 
         # 1. Handle Multiline Comments
         if self.inside_multiline_comment:
-            if "*/" in line:
+            # One find both detects the terminator and locates the rest of the line
+            comment_end_idx = line.find("*/")
+            if comment_end_idx != -1:
                 self.inside_multiline_comment = False
-                line = line.split("*/", 1)[1]
+                line = line[comment_end_idx + 2:]
                 self.logger.trace(f"L{self.line_num}: Multiline comment ends. Remaining: `{escape_angle_brackets(line.strip())}`")
                 
-                if not line.strip():
+                if not line or line.isspace():
                     return # Nothing left on line
 
             else:
@@ -391,15 +461,17 @@ class PlSqlStructuralParser:
 
         # Must handle comments *before* string/inline comment removal
         # Handle start of multiline comment `/*` potentially after some code
-        if "/*" in line:
-            before_comment, _, after_comment = line.partition("/*")
-            if "*/" in after_comment: # Starts and ends on the same line
+        comment_start_idx = line.find("/*")
+        if comment_start_idx != -1:
+            before_comment = line[:comment_start_idx]
+            comment_end_idx = line.find("*/", comment_start_idx + 2)
+            if comment_end_idx != -1: # Starts and ends on the same line
                 # Handle comment contained entirely within the line
-                line_without_block_comment = before_comment + after_comment.split("*/", 1)[1]
+                line_without_block_comment = before_comment + line[comment_end_idx + 2:]
                 self.logger.trace(f"L{self.line_num}: Handled single-line block comment. Remaining: `{escape_angle_brackets(line_without_block_comment.strip())}`")
                 line = line_without_block_comment
                 
-                if not line.strip():
+                if not line or line.isspace():
                     return
              
             else:
@@ -410,7 +482,7 @@ class PlSqlStructuralParser:
                 # Continue processing 'line'
 
         # Skip empty lines after potential comment removal
-        if not line.strip():
+        if not line or line.isspace():
             self.logger.trace(f"L{self.line_num}: Line empty after multiline comment handling.")
             return
 
@@ -426,7 +498,7 @@ class PlSqlStructuralParser:
         self.logger.trace(f"L{self.line_num}: Processed Line: {escape_angle_brackets(repr(processed_line))}")
         
         # Skip lines that become empty after string/comment removal
-        if not processed_line.strip():
+        if not processed_line or processed_line.isspace():
             self.logger.trace(f"L{self.line_num}: Line empty after string/inline comment removal.")
             return
 
@@ -479,7 +551,7 @@ class PlSqlStructuralParser:
 
             obj_type, obj_name, has_end = obj_match.groups() # Ensure only first two groups are taken - Extract type and name
             obj_name = obj_name.replace("\"", "") # Clean name
-            self.logger.info(f"L{self.line_num}: Found {obj_type.upper()} {obj_name}")
+            self.logger.info(f"L{self.line_num}: Found {_canonical_keyword(obj_type)} {obj_name}")
 
             self._clear_forward_decl_candidate(reason=f"New object '{obj_name}' found")
             self._push_scope(self.line_num, obj_type, obj_name)
@@ -508,24 +580,27 @@ class PlSqlStructuralParser:
             # Continue processing line for keywords like IS/AS/BEGIN
 
         # Handle case where PROCEDURE/FUNCTION keyword is on one line, name on the next
-        elif re.search(r"\b(FUNCTION|PROCEDURE)\b", processed_line.strip(), re.IGNORECASE):
-
-            # Check if it looks like just the keyword, e.g., ends with it or only whitespace after
-            m = re.search(r"\b(FUNCTION|PROCEDURE)\s*$", processed_line.strip(), re.IGNORECASE)
-
-            if m:
-                self.multiline_object_name_pending = m.group(1)
-                self.logger.trace(f"L{self.line_num}: Object definition keyword '{self.multiline_object_name_pending}' found, name potentially on next line.")
-                return # Expect name on the next line
+        # i.e. the line ends with just the keyword (only whitespace after it). The regex already
+        # tolerates surrounding whitespace, so the line is searched as-is, without a stripped copy.
+        elif m := OBJECT_KEYWORD_AT_LINE_END_REGEX.search(processed_line):
+            self.multiline_object_name_pending = m.group(1)
+            self.logger.trace(f"L{self.line_num}: Object definition keyword '{self.multiline_object_name_pending}' found, name potentially on next line.")
+            return # Expect name on the next line
+
+        # Scan the line once for block keywords and ENDs; the one-line, END and block-start checks below share the matches
+        keyword_matches: List[re.Match] = []
+        end_matches: List[re.Match] = []
+        for block_match in BLOCK_KEYWORD_OR_END_REGEX.finditer(processed_line):
+            (end_matches if block_match.lastindex == 1 else keyword_matches).append(block_match)
 
         # --- Check for Keywords Requiring END (One Line) --- #
         # Needs to be checked before individual keywords like BEGIN/END
-        one_line_match = KEYWORDS_REQUIRING_END_ONE_LINE_REGEX.search(processed_line)
-        if one_line_match:
+        # A keyword with an END somewhere after it on the line - what KEYWORDS_REQUIRING_END_ONE_LINE_REGEX matches
+        if keyword_matches and end_matches and end_matches[-1].start() >= keyword_matches[0].end():
 
             # Count keywords vs ENDs on the line
-            keywords = [keyword.casefold() for keyword in KEYWORDS_REQUIRING_END_REGEX.findall(processed_line)]
-            ends = END_CHECK_REGEX.findall(processed_line)
+            keywords = [keyword_match.group(2).casefold() for keyword_match in keyword_matches]
+            ends = [end_match.group(1) for end_match in end_matches]
             self.logger.trace(f"L{self.line_num}: Found one-line block(s). Keywords: {keywords}, ENDs: {ends}.")
 
             if len(ends) > len(keywords):
@@ -553,14 +628,11 @@ class PlSqlStructuralParser:
                                 obj_key = ended_name.casefold()
                                 if obj_key in self.collected_code_objects:
 
-                                    # Find the corresponding entry (usually the last one for this key) and update end line
-                                    for entry in reversed(self.collected_code_objects[obj_key]):
-
-                                        # Match on start line to be certain, although usually last is correct
-                                        if entry['start'] == start_idx and entry['end'] == -1:
-                                            entry['end'] = self.line_num
-                                            self.logger.trace(f"Updated end line for {ended_name} to {self.line_num}")
-                                            break
+                                    # Update end line of the entry recorded when the scope was pushed
+                                    entry = scope_state.get("code_object")
+                                    if entry is not None and entry['end'] == -1:
+                                        entry['end'] = self.line_num
+                                        self.logger.trace(f"Updated end line for {ended_name} to {self.line_num}")
 
                             log_level = "INFO" if ended_type in ["PACKAGE", "PROCEDURE", "FUNCTION"] else "DEBUG"
                             self.logger.log(log_level, f"L{start_idx}-{self.line_num}: END {ended_type} {ended_name}")
@@ -574,7 +646,7 @@ class PlSqlStructuralParser:
             # Handle scope BEGIN on same line
             # If BEGIN is involved, check if it's the scope's BEGIN
             for keyword in keywords:
-                keyword_upper = keyword.upper()
+                keyword_upper = _canonical_keyword(keyword)
 
                 # Special handling for BEGIN: Associate with current scope if it hasn't seen one
                 if keyword == 'begin':
@@ -593,12 +665,12 @@ class PlSqlStructuralParser:
                 elif keyword == 'for':
                      
                     # Ignore 'FOR UPDATE' and 'OPEN cursor FOR query'
-                    if re.search(r"\bFOR\s+UPDATE\b", processed_line, re.IGNORECASE) or re.search(r"\bOPEN\s+\S+\s+FOR\b", processed_line, re.IGNORECASE):
+                    if NON_LOOP_FOR_REGEX.search(processed_line):
                         self.logger.trace(f"L{self.line_num}: Ignoring 'FOR' as part of UPDATE or OPEN statement.")
                         continue # Skip this keyword
 
                     # Check if LOOP is on the same line
-                    if re.search(r"\bFOR\b.*\bLOOP\b", processed_line, re.IGNORECASE):
+                    if FOR_LOOP_ONE_LINE_REGEX.search(processed_line):
                         self.logger.trace(f"L{self.line_num}: FOR with LOOP on same line.")
                         self._push_block(self.line_num, keyword_upper)
 
@@ -610,7 +682,7 @@ class PlSqlStructuralParser:
                 # Handling WHILE loop start
                 elif keyword == 'while':
                     # Check if LOOP is on the same line
-                    if re.search(r"\bWHILE\b.*\bLOOP\b", processed_line, re.IGNORECASE):
+                    if WHILE_LOOP_ONE_LINE_REGEX.search(processed_line):
                         self.logger.trace(f"L{self.line_num}: WHILE with LOOP on same line.")
                         self._push_block(self.line_num, keyword_upper)
                     else:
@@ -633,8 +705,8 @@ class PlSqlStructuralParser:
             return # Handled one-liner
 
         # --- Check for END Keyword --- #
-        if END_CHECK_REGEX.search(processed_line):
-            ends_found = len(END_CHECK_REGEX.findall(processed_line))
+        if end_matches:
+            ends_found = len(end_matches)
             self.logger.trace(f"L{self.line_num}: Found {ends_found} 'END' keyword(s) on the line.")
             for _ in range(ends_found):
                 if self.block_stack:
@@ -660,14 +732,11 @@ class PlSqlStructuralParser:
                             if not scope_state.get("has_seen_begin"):
                                 self.logger.error(f"L{self.line_num}: Found END for {ended_type} {ended_name} but it hasn't seen a BEGIN yet!")
 
-                            # Find the corresponding entry (usually the last one for this key) and update end line
-                            for entry in reversed(self.collected_code_objects[obj_key]):
-
-                                # Match on start line to be certain, although usually last is correct
-                                if entry['start'] == start_idx and entry['end'] == -1:
-                                    entry['end'] = self.line_num
-                                    self.logger.trace(f"Updated end line for {ended_name} to {self.line_num}")
-                                    break
+                            # Update end line of the entry recorded when the scope was pushed
+                            entry = scope_state.get("code_object")
+                            if entry is not None and entry['end'] == -1:
+                                entry['end'] = self.line_num
+                                self.logger.trace(f"Updated end line for {ended_name} to {self.line_num}")
 
                     log_level = "INFO" if ended_type in ["PACKAGE", "PROCEDURE", "FUNCTION"] else "DEBUG"
                     self.logger.log(log_level, f"L{start_idx}-{self.line_num}: END {ended_type} {ended_name}")
@@ -676,10 +745,9 @@ class PlSqlStructuralParser:
             return # Handled END
 
         # --- Check for Block Starting Keywords --- #
-        # Use findall to catch multiple keywords on one line (e.g. IF condition THEN IF ...)
-        keywords_found = KEYWORDS_REQUIRING_END_REGEX.findall(processed_line)
-        if keywords_found:
-            current_keywords = [kw.casefold() for kw in keywords_found]
+        # Every keyword on the line is handled (e.g. IF condition THEN IF ...)
+        if keyword_matches:
+            current_keywords = [keyword_match.group(2).casefold() for keyword_match in keyword_matches]
             self.logger.trace(f"L{self.line_num}: Keywords requiring END found: {current_keywords}")
 
             # Handle awaited LOOPs
@@ -695,7 +763,7 @@ class PlSqlStructuralParser:
 
             # Process remaining keywords
             for keyword in current_keywords:
-                keyword_upper = keyword.upper()
+                keyword_upper = _canonical_keyword(keyword)
 
                 # Special handling for BEGIN: Associate with current scope if it hasn't seen one
                 if keyword == 'begin':
@@ -714,12 +782,12 @@ class PlSqlStructuralParser:
                 elif keyword == 'for':
                      
                     # Ignore 'FOR UPDATE' and 'OPEN cursor FOR query'
-                    if re.search(r"\bFOR\s+UPDATE\b", processed_line, re.IGNORECASE) or re.search(r"\bOPEN\s+\S+\s+FOR\b", processed_line, re.IGNORECASE):
+                    if NON_LOOP_FOR_REGEX.search(processed_line):
                         self.logger.trace(f"L{self.line_num}: Ignoring 'FOR' as part of UPDATE or OPEN statement.")
                         continue # Skip this keyword
 
                     # Check if LOOP is on the same line
-                    if re.search(r"\bFOR\b.*\bLOOP\b", processed_line, re.IGNORECASE):
+                    if FOR_LOOP_ONE_LINE_REGEX.search(processed_line):
                         self.logger.trace(f"L{self.line_num}: FOR with LOOP on same line.")
                         self._push_block(self.line_num, keyword_upper)
                         # Implicitly consume loop if also found by regex
@@ -733,7 +801,7 @@ class PlSqlStructuralParser:
                 # Handling WHILE loop start
                 elif keyword == 'while':
                     # Check if LOOP is on the same line
-                    if re.search(r"\bWHILE\b.*\bLOOP\b", processed_line, re.IGNORECASE):
+                    if WHILE_LOOP_ONE_LINE_REGEX.search(processed_line):
                         self.logger.trace(f"L{self.line_num}: WHILE with LOOP on same line.")
                         self._push_block(self.line_num, keyword_upper)
 
@@ -767,8 +835,7 @@ class PlSqlStructuralParser:
         self.reset_state() # Ensure clean state before parsing
         self.logger.info("Starting PL/SQL code parsing...")
 
-        self.code = code
-        self.lines = code.splitlines(keepends=True)
+        self._load_code(code)
 
         # Wrap lines iteration with tqdm for progress bar
         line_iterator = tqdm(enumerate(self.lines),
@@ -2,9 +2,10 @@
 from __future__ import annotations
 import sqlite3
 import json
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Optional, TYPE_CHECKING
+from typing import Iterator, Optional, TYPE_CHECKING
 import loguru as lg # Assuming logger is passed
 
 if TYPE_CHECKING:
@@ -23,12 +24,24 @@ def convert_datetime(val: bytes) -> datetime: # val is bytes
 sqlite3.register_adapter(datetime, adapt_datetime_iso)
 sqlite3.register_converter("datetime", convert_datetime) # Name should be "datetime" not "TIMESTAMP" for auto-detection by PARSE_DECLTYPES
 
+# Number of write operations grouped into a single commit while a batch is open
+DEFAULT_BATCH_COMMIT_EVERY = 500
+
 
 class DatabaseManager:
-    def __init__(self, db_path: Path, logger: lg.Logger):
+    def __init__(self, db_path: Path | str, logger: lg.Logger, uri: bool = False):
+        # With `uri=True`, `db_path` is an SQLite URI (e.g. a `file:name?mode=memory&cache=shared` database)
         self.db_path = db_path
+        self.uri = uri
         self.logger = logger.bind(db_path=str(db_path))
-        self._ensure_db_dir_exists()
+        if not uri:
+            self._ensure_db_dir_exists()
+
+        # Batch state: while a batch is open all operations share one connection
+        # and writes are committed every `_batch_commit_every` operations.
+        self._batch_conn: Optional[sqlite3.Connection] = None
+        self._batch_commit_every = DEFAULT_BATCH_COMMIT_EVERY
+        self._batch_pending_writes = 0
 
     def _ensure_db_dir_exists(self):
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -36,17 +49,98 @@ class DatabaseManager:
 
     def _connect(self) -> sqlite3.Connection:
         self.logger.trace("Trying to connect to DB")
-        conn = sqlite3.connect(self.db_path, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES)
+        conn = sqlite3.connect(self.db_path, detect_types=sqlite3.PARSE_DECLTYPES | sqlite3.PARSE_COLNAMES, uri=self.uri)
         conn.execute("PRAGMA foreign_keys = ON;")
+        # NORMAL skips the fsync per commit and is only crash-safe in WAL mode (enabled by `setup_database`)
+        if conn.execute("PRAGMA journal_mode;").fetchone()[0] == "wal":
+            conn.execute("PRAGMA synchronous = NORMAL;")
         conn.row_factory = sqlite3.Row
         self.logger.trace("Database connection established.")
         return conn
 
+    @contextmanager
+    def _connection(self, is_write: bool = False) -> Iterator[sqlite3.Connection]:
+        """
+        Yields a connection for a single operation.
+        Outside a batch a fresh connection is used and committed on success.
+        Inside a batch the shared connection is used and writes are only counted,
+        the commit happening once `_batch_commit_every` writes are pending.
+        Each batched write runs in its own savepoint, so a write that fails is
+        undone without discarding the batch's other pending writes.
+        """
+        if self._batch_conn is None:
+            with self._connect() as conn:
+                yield conn
+            return
+
+        conn = self._batch_conn
+        if not is_write:
+            yield conn
+            return
+
+        # Outside a transaction, RELEASE of the savepoint would commit on its own
+        if not conn.in_transaction:
+            conn.execute("BEGIN")
+        conn.execute("SAVEPOINT batch_write")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK TO batch_write")
+            conn.execute("RELEASE batch_write")
+            raise
+        conn.execute("RELEASE batch_write")
+
+        self._batch_pending_writes += 1
+        if self._batch_pending_writes >= self._batch_commit_every:
+            self._flush_batch()
+
+    def _flush_batch(self):
+        if self._batch_conn is None:
+            return
+        self._batch_conn.commit()
+        self.logger.debug(f"Committed {self._batch_pending_writes} batched write(s).")
+        self._batch_pending_writes = 0
+
+    def begin_batch(self, commit_every: int = DEFAULT_BATCH_COMMIT_EVERY):
+        """
+        Starts grouping write operations into larger transactions.
+        Until `commit_batch` is called, all operations share one connection and
+        pending writes are committed every `commit_every` operations.
+        """
+        if self._batch_conn is not None:
+            self.logger.warning("A database batch is already open. Ignoring begin_batch call.")
+            return
+
+        self._batch_conn = self._connect()
+        self._batch_commit_every = max(1, commit_every)
+        self._batch_pending_writes = 0
+        self.logger.debug(f"Started database batch (commit every {self._batch_commit_every} writes).")
+
+    def commit_batch(self):
+        """Commits any pending writes of the open batch and closes its connection."""
+        if self._batch_conn is None:
+            self.logger.warning("No database batch is open. Ignoring commit_batch call.")
+            return
+
+        try:
+            self._flush_batch()
+        except sqlite3.Error as e:
+            self.logger.error("Failed to commit pending batched writes.")
+            self.logger.exception(e)
+            raise
+        finally:
+            self._batch_conn.close()
+            self._batch_conn = None
+            self._batch_pending_writes = 0
+        self.logger.debug("Closed database batch.")
+
     def setup_database(self):
         self.logger.info("Setting up database schemas (if needed).")
         try:
             with self._connect() as conn:
                 cursor = conn.cursor()
+                # WAL is persistent for the database file: commits append to the log instead of rewriting pages
+                cursor.execute("PRAGMA journal_mode = WAL;")
                 cursor.execute("""
                     CREATE TABLE IF NOT EXISTS Processed_PLSQL_Files (
                         file_path TEXT PRIMARY KEY,
@@ -94,7 +188,7 @@ class DatabaseManager:
     def get_file_hash(self, fpath: str) -> Optional[str]:
         self.logger.debug(f"Querying stored hash for {fpath}")
         try:
-            with self._connect() as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT file_hash FROM Processed_PLSQL_Files WHERE file_path = ?", (fpath,))
                 result = cursor.fetchone()
@@ -115,7 +209,7 @@ class DatabaseManager:
         self.logger.debug(f"Updating Hash for: {fpath}")
         now_ts = datetime.now(timezone.utc)
         try:
-            with self._connect() as conn:
+            with self._connection(is_write=True) as conn:
                 cursor = conn.cursor()
                 # Clear old code objects associated with this file path before updating hash
                 # This handles cases where a file is changed and objects are removed/renamed
@@ -126,7 +220,6 @@ class DatabaseManager:
                     "INSERT OR REPLACE INTO Processed_PLSQL_Files (file_path, file_hash, last_processed_ts) VALUES (?, ?, ?)",
                     (fpath, file_hash, now_ts)
                 )
-                conn.commit()
                 self.logger.debug(f"Inserted/Replaced hash record for {fpath}")
                 return True
         except sqlite3.Error as e:
@@ -138,12 +231,11 @@ class DatabaseManager:
         """Removes a file record and its associated code objects from the database."""
         self.logger.debug(f"Attempting to remove file record for: {fpath}")
         try:
-            with self._connect() as conn:
+            with self._connection(is_write=True) as conn:
                 cursor = conn.cursor()
                 # The ON DELETE CASCADE constraint on Extracted_PLSQL_CodeObjects.file_path
                 # will ensure associated code objects are also deleted.
                 cursor.execute("DELETE FROM Processed_PLSQL_Files WHERE file_path = ?", (fpath,))
-                conn.commit()
                 if cursor.rowcount > 0:
                     self.logger.info(f"Successfully removed file record and associated code objects for {fpath}.")
                     return True
@@ -165,7 +257,7 @@ class DatabaseManager:
             return False
 
         try:
-            with self._connect() as conn:
+            with self._connection(is_write=True) as conn:
                 cursor = conn.cursor()
                 code_obj_dict_for_db = codeobject.to_dict()
                 
@@ -188,7 +280,6 @@ class DatabaseManager:
                         now_ts
                     )
                 )
-                conn.commit()
                 self.logger.debug(f"Inserted/Replaced {obj_repr_for_log} (ID: {codeobject.id}) for {fpath}")
                 return True
         except sqlite3.Error as e:
@@ -201,7 +292,7 @@ class DatabaseManager:
         self.logger.debug("Fetching all code objects from database.")
         objects = []
         try:
-            with self._connect() as conn:
+            with self._connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute("SELECT id, package_name, object_name, object_type, codeobject_data FROM Extracted_PLSQL_CodeObjects")
                 for row in cursor.fetchall():
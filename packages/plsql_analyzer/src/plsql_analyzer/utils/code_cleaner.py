@@ -8,17 +8,98 @@ This module provides functions for preprocessing PL/SQL code, including:
 """
 from __future__ import annotations
 import loguru as lg
-from typing import Tuple, Dict
+import re
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Tuple, Dict, List
 
+# Number of distinct code strings whose cleaning result is memoized.
+# Sized for repeated snippets; whole files are cleaned once and bypass the cache.
+CLEANED_CODE_CACHE_SIZE = 128
 
-def clean_code_and_map_literals(code: str, logger: lg.Logger) -> Tuple[str, Dict[str, str]]:
+# Comments and string literals in a single alternation, tried in this order at each position.
+# Unclosed block comments and literals run to the end of the code; `''` stays inside a literal.
+# Possessive quantifiers keep every branch linear: nothing is ever re-scanned on a failed match.
+_TOKEN_REGEX = re.compile(
+    r"""
+    /\*[^*]*+(?:\*(?!/)[^*]*+)*+(?:\*/|\Z)          # block comment, ends at the first */
+    | --[^\n]*+                                     # inline comment, newline is kept
+    | '(?P<literal>[^']*+(?:''[^']*+)*+)(?P<close>'|\Z)  # string literal
+    """,
+    re.DOTALL | re.VERBOSE,
+)
+
+# Placeholder tags are shared across calls and grown on demand by `_literal_tag`
+_LITERAL_TAGS: List[str] = [f"<LITERAL_{i}>" for i in range(64)]
+
+
+def _literal_tag(index: int) -> str:
+    """Returns the placeholder tag for the literal at `index`, extending the tag cache if needed."""
+    if index >= len(_LITERAL_TAGS):
+        _LITERAL_TAGS.extend(f"<LITERAL_{i}>" for i in range(len(_LITERAL_TAGS), index + 1))
+    return _LITERAL_TAGS[index]
+
+
+def _scan_code_uncached(code: str) -> Tuple[str, Dict[str, str]]:
+    """Strips comments and maps literals for `code` in a single pass."""
+    # One left-to-right pass: text between tokens is copied verbatim, comments are
+    # dropped (the newline ending an inline comment stays outside the match) and
+    # literals are swapped for placeholders. Hot-loop names are bound to locals.
+    literal_mapping: Dict[str, str] = {}
+    mapping_set = literal_mapping.__setitem__
+    clean_code_chars: List[str] = []
+    out_append = clean_code_chars.append
+    literal_tag = _literal_tag
+    literal_index = 0
+    last_end = 0
+
+    for match in _TOKEN_REGEX.finditer(code):
+        literal_body = match.group("literal")
+        out_append(code[last_end:match.start()])
+        last_end = match.end()
+        if literal_body is None:
+            continue
+
+        literal_name = literal_tag(literal_index)
+        literal_index += 1
+        mapping_set(literal_name, literal_body)
+        out_append("'")
+        out_append(literal_name)
+        # Unclosed string literal runs to the end of code and gets no closing quote
+        if match.group("close"):
+            out_append("'")
+
+    out_append(code[last_end:])
+
+    return "".join(clean_code_chars), literal_mapping
+
+
+@lru_cache(maxsize=CLEANED_CODE_CACHE_SIZE)
+def _scan_code(code: str) -> Tuple[str, MappingProxyType]:
+    """
+    Memoized `_scan_code_uncached`. The literal mapping is returned as a read-only
+    view since it is shared between calls; callers get their own copy.
+    """
+    cleaned_code, literal_mapping = _scan_code_uncached(code)
+    return cleaned_code, MappingProxyType(literal_mapping)
+
+
+def clear_cleaning_cache() -> None:
+    """Drops all memoized cleaning results (e.g. for long-running sessions or test isolation)."""
+    _scan_code.cache_clear()
+
+
+def clean_code_and_map_literals(code: str, logger: lg.Logger, use_cache: bool = True) -> Tuple[str, Dict[str, str]]:
     """
     Removes comments and replaces string literals with placeholders.
     Returns the cleaned code and a mapping of placeholders to original literals.
+    Results for recently seen code are served from a small cache.
     
     Args:
         code: The PL/SQL code to be processed
         logger: A logger instance for logging operations
+        use_cache: Whether to memoize the result. Pass False for code that is cleaned
+            only once (e.g. whole source files), so it is not kept alive by the cache.
         
     Returns:
         A tuple containing:
@@ -26,79 +107,16 @@ def clean_code_and_map_literals(code: str, logger: lg.Logger) -> Tuple[str, Dict
         - literal_mapping: A dictionary mapping placeholder strings to original literals
     """
     logger.debug("Cleaning code: removing comments and string literals.")
-    literal_mapping: Dict[str, str] = {}
-    inside_quote = False
-    inside_inline_comment = False
-    inside_multiline_comment = False
-
-    idx = 0
-    clean_code_chars = [] 
-    current_literal_chars = []
-
-    while idx < len(code):
-        current_char = code[idx]
-        next_char = code[idx + 1] if (idx + 1) < len(code) else None
-
-        if inside_inline_comment:
-            if current_char == "\n":
-                inside_inline_comment = False
-                clean_code_chars.append('\n')
-            idx += 1
-            continue
 
-        if inside_multiline_comment:
-            if f"{current_char}{next_char}" == "*/":
-                inside_multiline_comment = False
-                idx += 2
-            else:
-                idx += 1
-            continue
-        
-        if f"{current_char}{next_char}" == "/*" and not inside_quote:
-            inside_multiline_comment = True
-            idx += 2
-            continue
+    # Fast path: nothing to strip or replace, the scanner would copy the code verbatim
+    if "'" not in code and "--" not in code and "/*" not in code:
+        logger.debug(f"Code cleaning skipped. No literals or comments found in code of length {len(code)}.")
+        return code, {}
 
-        if f"{current_char}{next_char}" == "--" and not inside_quote:
-            inside_inline_comment = True
-            idx += 1 
-            continue
-        
-        if inside_quote and current_char == "'" and next_char == "'":
-            current_literal_chars.append("''") 
-            idx += 2
-            continue
-
-        if current_char == "'":
-            inside_quote = not inside_quote
-
-            if not inside_quote: 
-                literal_name = f"<LITERAL_{len(literal_mapping)}>"
-                literal_mapping[literal_name] = "".join(current_literal_chars)
-                current_literal_chars = []
-                clean_code_chars.append(literal_name) 
-                clean_code_chars.append("'")
-            
-            else:
-                clean_code_chars.append("'")
-
-            idx += 1
-            continue
-        
-        if inside_quote:
-            current_literal_chars.append(current_char)
-        else:
-            clean_code_chars.append(current_char)
-        
-        idx += 1
-    
-    # Handle unclosed string literal at end of code
-    if inside_quote:
-        literal_name = f"<LITERAL_{len(literal_mapping)}>"
-        literal_mapping[literal_name] = "".join(current_literal_chars)
-        current_literal_chars = []
-        clean_code_chars.append(literal_name)
-    
-    cleaned_code_str = "".join(clean_code_chars)
+    if use_cache:
+        cleaned_code_str, cached_mapping = _scan_code(code)
+        literal_mapping = dict(cached_mapping)
+    else:
+        cleaned_code_str, literal_mapping = _scan_code_uncached(code)
     logger.debug(f"Code cleaning complete. Original Code Length: {len(code)}, Cleaned code length: {len(cleaned_code_str)}, Literals found: {len(literal_mapping)}")
     return cleaned_code_str, literal_mapping
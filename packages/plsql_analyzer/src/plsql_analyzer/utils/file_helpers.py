@@ -1,8 +1,9 @@
 # plsql_analyzer/utils/file_helpers.py
 from __future__ import annotations
+import os
 import hashlib
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterator, List, Optional
 import loguru as lg  # Expect logger to be passed or use a module-level one
 
 class FileHelpers:
@@ -17,11 +18,9 @@ class FileHelpers:
                 self.logger.error(f"File not found for hashing: {fpath}")
                 return None
 
-            hash_func = hashlib.new(algorithm)
             with open(fpath, 'rb') as f:
-                while chunk := f.read(2**16): # Read in 64k chunks
-                    hash_func.update(chunk)
-            hex_digest = hash_func.hexdigest()
+                # file_digest reads and hashes in C, without a Python-level chunk loop
+                hex_digest = hashlib.file_digest(f, algorithm).hexdigest()
             self.logger.trace(f"Computed hash for {fpath}: {hex_digest[:10]}...")
             return hex_digest
         except FileNotFoundError: # Should be caught by is_file(), but good to have
@@ -35,6 +34,32 @@ class FileHelpers:
             self.logger.exception(e)
             return None
 
+    def walk_source_tree(self, root: Path | str, file_extensions: List[str]) -> Iterator[str]:
+        """
+        Recursively yields the paths (as strings) of files under `root` ending with
+        one of `file_extensions`.
+        Uses an explicit stack of `os.scandir` calls so no `Path` object is built per
+        file, and the directory entry type is read from the scan itself.
+        Symlinked directories are not followed (same as `Path.rglob`).
+        Extensions match case-insensitively on Windows, following the platform like `rglob` did.
+        """
+        ignore_case = os.name == "nt"
+        suffixes = tuple(f".{ext.lower() if ignore_case else ext}" for ext in file_extensions)
+        self.logger.trace(f"Walking source tree {root} for files ending with {suffixes}")
+
+        pending_dirs = [os.fspath(root)]
+        while pending_dirs:
+            current_dir = pending_dirs.pop()
+            try:
+                with os.scandir(current_dir) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending_dirs.append(entry.path)
+                        elif (entry.name.lower() if ignore_case else entry.name).endswith(suffixes) and entry.is_file():
+                            yield entry.path
+            except OSError as e:
+                self.logger.warning(f"Could not scan directory {current_dir}: {e}")
+
     def get_processed_fpath(self, fpath: Path, exclude_from_path: List[str]) -> Path:
         """
         Creates a string representation of the file path, excluding specified parent directories.
@@ -43,8 +68,8 @@ class FileHelpers:
         self.logger.trace(f"Processing fpath string for {fpath} excluding {exclude_from_path}")
         try:
             new_fpath_parts = []
-            # Normalize exclusion list to lowercase for case-insensitive comparison
-            exclude_from_path_lower = [x.casefold() for x in exclude_from_path]
+            # Normalize exclusion names to lowercase for case-insensitive comparison
+            exclude_from_path_lower = {x.casefold() for x in exclude_from_path}
 
             # Iterate through each part of the original file path
             for part in fpath.parts:
@@ -94,7 +119,9 @@ class FileHelpers:
         self.logger.trace(f"Deriving package name for file '{fpath}'. Initial package from code: '{package_name_from_code}'. Excluding path parts: {exclude_parts_for_pkg_derivation}. File extensions: {file_extensions}")
 
         # Normalize exclusion parts to lowercase for case-insensitive comparison
-        exclude_parts_lower = [part.casefold() for part in exclude_parts_for_pkg_derivation]
+        exclude_parts_lower = {part.casefold() for part in exclude_parts_for_pkg_derivation}
+        # Built once per call rather than once per path segment and extension
+        file_suffixes = tuple(f'.{ext}' for ext in file_extensions)
 
         # 1. Collect path-derived components (stripped, original case)
         # These are potential prefixes to be added to the package name.
@@ -105,14 +132,8 @@ class FileHelpers:
 
             # Remove file extension (if present) from the current path segment
             # NOTE: This logic might incorrectly remove parts of directory names if they match '.{file_extension}'
-            file_extension = None
-            for ext in file_extensions:
-                if path_segment.endswith(f'.{ext}'):
-                    file_extension = ext
-                    self.logger.trace(f"File extension found: '{file_extension}' for segment '{path_segment}'")
-                    break
-
-            if file_extension:
+            if path_segment.endswith(file_suffixes):
+                self.logger.trace(f"File extension found for segment '{path_segment}'")
                 name_part = Path(path_segment).stem
             else:
                 name_part = path_segment
@@ -246,4 +246,15 @@ class TestPLSQLSignatureParser:
             {'name': 'p_param9', 'mode': 'IN', 'type': 'VARCHAR2', 'default_value': 'NULL'},
             {'name': 'p_param10', 'mode': 'IN', 'type': 'VARCHAR2', 'default_value': 'NULL'}
         ]
-        
\ No newline at end of file
+        
+    def test_parsers_share_one_grammar(self, parser: PLSQLSignatureParser, test_logger: lg.Logger):
+        other = PLSQLSignatureParser(logger=test_logger)
+        assert other.proc_or_func_signature is parser.proc_or_func_signature
+        assert other.parse("PROCEDURE p (a IN NUMBER) IS") == parser.parse("PROCEDURE p (a IN NUMBER) IS")
+
+    def test_signature_keyword_prefilter(self, parser: PLSQLSignatureParser):
+        # Text without PROCEDURE/FUNCTION is rejected up front; embedded signatures are still found
+        assert parser.parse("DECLARE l_x NUMBER; BEGIN NULL; END;") is None
+        result = parser.parse("/* header */ create or replace function f RETURN NUMBER IS")
+        assert result is not None
+        assert result["func_name"] == "f"
@@ -1,13 +1,15 @@
 from __future__ import annotations
+import os
 import sys
 import json
+import functools
 import pytest
 from pathlib import Path
 from unittest.mock import patch
 import loguru as lg
 
 from plsql_analyzer.orchestration.extraction_workflow import clean_code_and_map_literals
-from plsql_analyzer.parsing.structural_parser import PlSqlStructuralParser, OBJECT_NAME_REGEX, PACKAGE_NAME_REGEX, END_CHECK_REGEX, KEYWORDS_REQUIRING_END_REGEX, KEYWORDS_REQUIRING_END_ONE_LINE_REGEX
+from plsql_analyzer.parsing.structural_parser import PlSqlStructuralParser, OBJECT_NAME_REGEX, PACKAGE_NAME_REGEX, END_CHECK_REGEX, KEYWORDS_REQUIRING_END_REGEX, KEYWORDS_REQUIRING_END_ONE_LINE_REGEX, BLOCK_KEYWORD_OR_END_REGEX
 
 # Relative import for the class to be tested
 
@@ -20,9 +22,8 @@ from plsql_analyzer.parsing.structural_parser import PlSqlStructuralParser, OBJE
 def basic_parser(test_logger) -> PlSqlStructuralParser:
     """Provides a basic PlSqlStructuralParser instance for testing."""
     # Minimal code, as most methods operate on current_line_content or specific state
-    parser = PlSqlStructuralParser(logger=test_logger, verbose_lvl=0)
-    parser.reset_state() # Ensure clean state
-    return parser
+    # __init__ already sets the same defaults as reset_state (see test_parser_initialization)
+    return PlSqlStructuralParser(logger=test_logger, verbose_lvl=0)
 
 # --- Test Regular Expressions ---
 
@@ -38,6 +39,10 @@ def basic_parser(test_logger) -> PlSqlStructuralParser:
     ("PROCEDURE\nmy_proc\nIS", True, ("PROCEDURE", "my_proc")), # Regex expects name on same line as keyword for basic match
     ("FUNCTION f_test RETURN NUMBER; -- fwd decl", True, ("FUNCTION", "f_test")),
     ("PROCEDURE p_test(a IN NUMBER); -- fwd decl", True, ("PROCEDURE", "p_test")),
+], ids=[
+    "procedure_is", "function_return_as", "quoted_dotted_name", "lowercase_with_params", "qualified_name",
+    "missing_is_as", "after_create", "type_not_matched", "name_on_next_line", "function_fwd_decl",
+    "procedure_fwd_decl",
 ])
 def test_object_name_regex(text, expected_match, expected_groups):
     match = OBJECT_NAME_REGEX.search(text)
@@ -111,6 +116,21 @@ def test_keywords_requiring_end_one_line_regex(text, expected_match, expected_ke
     else:
         assert match is None
 
+@pytest.mark.parametrize("text", [
+    "IF condition THEN statement; END IF;",
+    "FOR i IN 1..10 LOOP statement; END LOOP;",
+    "  if a then loop_var := 1; end if;",
+    "END IF; END LOOP; END;",
+    "CASE var WHEN 1 THEN BEGIN",
+    "PENDING_END := MY_VARIABLE_ENDING;",
+    "SELECT * FROM my_table;",
+])
+def test_block_keyword_or_end_regex_matches_separate_scans(text):
+    # The single-pass scan finds exactly what END_CHECK_REGEX and KEYWORDS_REQUIRING_END_REGEX find separately
+    matches = list(BLOCK_KEYWORD_OR_END_REGEX.finditer(text))
+    assert [m.span() for m in matches if m.lastindex == 1] == [m.span() for m in END_CHECK_REGEX.finditer(text)]
+    assert [m.span() for m in matches if m.lastindex == 2] == [m.span() for m in KEYWORDS_REQUIRING_END_REGEX.finditer(text)]
+
 # --- Test Class Methods ---
 
 def test_parser_initialization(basic_parser: PlSqlStructuralParser):
@@ -132,6 +152,8 @@ def test_parser_initialization(basic_parser: PlSqlStructuralParser):
     assert not basic_parser.is_awaiting_loop_for_for
     assert not basic_parser.is_awaiting_loop_for_while
     assert basic_parser.forward_decl_candidate is None
+    assert basic_parser.forward_decl_check_end_line is None
+    assert basic_parser.line_start_offsets == [0]
 
 def test_reset_state(basic_parser: PlSqlStructuralParser):
     # Modify some state
@@ -175,6 +197,12 @@ def test_reset_state(basic_parser: PlSqlStructuralParser):
 
     # Added After real files evals
     ("v_stgrec.RX_REFILL_NUM := TO_NUMBER(REPLACE(v_val,',',''));", False, "v_stgrec.RX_REFILL_NUM := TO_NUMBER(REPLACE(v_val,'',''));", False)
+], ids=[
+    "plain", "inline_comment", "string", "string_then_comment", "escaped_quote_in_string",
+    "comment_inside_string", "q_quote_unhandled", "unterminated_string", "continued_string_closes",
+    "comment_inside_continued_string", "string_inside_comment", "escaped_quote_then_text", "two_strings",
+    "empty", "whole_line_comment", "leading_space_comment", "unterminated_after_code",
+    "continued_string_no_space", "string_code_comment", "comma_literals",
 ])
 def test_remove_strings_and_inline_comments(basic_parser: PlSqlStructuralParser, line, initial_quote_state, expected_processed_line, expected_final_quote_state):
     processed_line, final_quote_state = basic_parser._remove_strings_and_inline_comments(line, initial_quote_state)
@@ -189,7 +217,8 @@ def test_push_pop_scope(basic_parser: PlSqlStructuralParser):
 
     basic_parser._push_scope(5, "PROCEDURE", "my_proc")
     assert len(basic_parser.scope_stack) == 2
-    assert basic_parser.scope_stack[1] == (5, ("PROCEDURE", "my_proc"), {"has_seen_begin": False, "is_package": False})
+    assert basic_parser.scope_stack[1] == (5, ("PROCEDURE", "my_proc"), {"has_seen_begin": False, "is_package": False, "code_object": {"start": 5, "end": -1, "type": "PROCEDURE"}})
+    assert basic_parser.scope_stack[1][2]["code_object"] is basic_parser.collected_code_objects["my_proc"][-1]
     assert "my_proc" in basic_parser.collected_code_objects
     assert basic_parser.collected_code_objects["my_proc"] == [{"start": 5, "end": -1, "type": "PROCEDURE"}]
 
@@ -214,6 +243,12 @@ def test_push_pop_scope(basic_parser: PlSqlStructuralParser):
     with pytest.raises(IndexError):
         basic_parser._pop_scope(reason="test")
 
+def test_push_block_stores_shared_keyword_objects(basic_parser: PlSqlStructuralParser):
+    basic_parser._push_block(1, "if")
+    basic_parser._push_block(2, "".join(["I", "F"])) # A fresh, non-interned "IF"
+    assert basic_parser.block_stack == [(1, "IF"), (2, "IF")]
+    assert basic_parser.block_stack[0][1] is basic_parser.block_stack[1][1]
+
 def test_push_pop_block(basic_parser: PlSqlStructuralParser):
     basic_parser._push_block(1, "IF")
     assert basic_parser.block_stack == [(1, "IF")]
@@ -242,8 +277,9 @@ def test_push_pop_block(basic_parser: PlSqlStructuralParser):
     (["PROCEDURE p_multi_fwd\n", "(param1 VARCHAR2);\n"], 1, "PROCEDURE", "p_multi_fwd", "(param1 VARCHAR2);", True), # Second line confirms
 ])
 def test_check_for_forward_decl_candidate(basic_parser: PlSqlStructuralParser, code_lines, scope_line, scope_type, scope_name, processed_line_at_scope, expect_candidate):
-    basic_parser.lines = code_lines
-    basic_parser.line_num = code_lines.index(f"{processed_line_at_scope}\n") + 1 # Simulate being at the end of the provided lines for check
+    basic_parser._load_code("".join(code_lines))
+    line_idx = {line.rstrip("\n"): idx for idx, line in reversed(list(enumerate(code_lines)))} # First occurrence wins, as with list.index
+    basic_parser.line_num = line_idx[processed_line_at_scope] + 1 # Simulate being at the end of the provided lines for check
     basic_parser.processed_line_content = processed_line_at_scope # This is the line content when check is made
 
     # Manually set up the state as if _push_scope just happened
@@ -257,6 +293,14 @@ def test_check_for_forward_decl_candidate(basic_parser: PlSqlStructuralParser, c
     else:
         assert basic_parser.forward_decl_candidate is None
 
+def test_code_since_line_matches_joined_lines(basic_parser: PlSqlStructuralParser):
+    code_lines = ["PROCEDURE p\n", "(a NUMBER)\n", "IS\n", "BEGIN NULL; END;"]
+    basic_parser._load_code("".join(code_lines))
+    for line_num in range(len(code_lines) + 2):
+        basic_parser.line_num = line_num
+        for start_line in range(1, len(code_lines) + 2):
+            assert basic_parser._code_since_line(start_line) == "".join(code_lines[start_line-1 : line_num])
+
 def test_clear_forward_decl_candidate(basic_parser: PlSqlStructuralParser):
     basic_parser.forward_decl_candidate = (1, ("PROCEDURE", "p_test"))
     basic_parser.forward_decl_check_end_line = 2
@@ -493,7 +537,7 @@ def test_process_line_one_liner_begin_end_scope(caplog, basic_parser: PlSqlStruc
 
 def test_process_line_forward_decl_procedure_confirmation(basic_parser: PlSqlStructuralParser):
     # Setup: A procedure was pushed and is a candidate
-    basic_parser.lines = ["PROCEDURE fwd_p (a NUMBER);\n"] # This is the line that _check_for_forward_decl_candidate would see
+    basic_parser._load_code("PROCEDURE fwd_p (a NUMBER);\n") # This is the line that _check_for_forward_decl_candidate would see
     basic_parser.line_num = 1
     basic_parser.processed_line_content = "PROCEDURE fwd_p (a NUMBER);" # This is the current processed line
     
@@ -510,13 +554,13 @@ def test_process_line_forward_decl_procedure_confirmation(basic_parser: PlSqlStr
     # Let's test the scenario where the *same line* confirms it via OBJECT_NAME_REGEX
     # and the forward_decl_candidate was already set (e.g. by a prior _check_for_forward_decl_candidate call)
     basic_parser.reset_state()
-    basic_parser.lines = ["PROCEDURE fwd_p;\n", "PROCEDURE bwd_p;\n"]
+    basic_parser._load_code("PROCEDURE fwd_p;\nPROCEDURE bwd_p;\n")
     basic_parser.line_num = 2
     basic_parser.current_line_content = "PROCEDURE bwd_p;"
     
     # Simulate _push_scope without the internal _check_for_forward_decl_candidate for this specific test flow
     # to isolate the _handle_forward_declaration call within _process_line
-    with patch.object(basic_parser, '_check_for_forward_decl_candidate'):
+    with patch.object(PlSqlStructuralParser, '_check_for_forward_decl_candidate'): # Class-level: the parser uses __slots__
         basic_parser._push_scope(1, "PROCEDURE", "fwd_p") # Pushes to scope_stack & collected_objects
     
     # Manually set the candidate, as if a previous check on this line (or part of it) determined it
@@ -555,13 +599,94 @@ TEST_LOGS_DIR = Path(__file__).parent.parent / "logs" / "structural_parser"
 TEST_LOGS_DIR.mkdir(parents=True, exist_ok=True) # Ensure the log directory exists
 
 TEST_INFO_FPATH = TEST_DATA_ROOT / "parse_method_test_cases.json"
-if TEST_INFO_FPATH.is_file():
-    with open(TEST_INFO_FPATH, 'r') as f:
-        PARSE_METHOD_TEST_CASES = json.load(f)
-else:
-    PARSE_METHOD_TEST_CASES = []
-@pytest.mark.parametrize("sql_file_path, expected_json_file_name", PARSE_METHOD_TEST_CASES)
-def test_parse_method_with_real_files(test_logger:lg.Logger, sql_file_path, expected_json_file_name):
+
+@functools.lru_cache(maxsize=None)
+def _read_text(path: str) -> str:
+    """Reads a test data file once per session, however many cases use it."""
+    return Path(path).read_text()
+
+@functools.lru_cache(maxsize=None)
+def _read_json(path: str):
+    """Loads a test data JSON file once per session. Callers must not mutate the result."""
+    return json.loads(Path(path).read_bytes())
+
+def pytest_generate_tests(metafunc: pytest.Metafunc):
+    """Parametrizes the real-file parse test from TEST_INFO_FPATH, with each case named after its SQL file."""
+    argnames = ("sql_file_path", "expected_json_file_name")
+    if not set(argnames) <= set(metafunc.fixturenames):
+        return
+
+    cases = json.loads(TEST_INFO_FPATH.read_bytes()) if TEST_INFO_FPATH.is_file() else []
+    metafunc.parametrize(argnames, cases, ids=[sql_file_path[-1] for sql_file_path, _ in cases])
+
+
+CASE_LOG_FORMAT = "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} - {message}"
+CASE_TRACE_LOG_FORMAT = "{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {extra[parser_type]} | {name}:{function}:{line} - {message}"
+
+class _CaseLogFiles:
+    """Loguru sink writing each message to `logs_dir/{case}_{suffix}.log`, keyed by the bound `case`.
+
+    Files are truncated the first time a case logs to them in the session and kept open until
+    `close()`, so running many cases costs one sink registration instead of three per case.
+    """
+
+    def __init__(self, logs_dir: Path, suffix: str):
+        self.logs_dir = logs_dir
+        self.suffix = suffix
+        self.files = {}
+
+    def __call__(self, message):
+        case = message.record["extra"]["case"]
+        log_file = self.files.get(case)
+        if log_file is None:
+            log_file = self.files[case] = open(self.logs_dir / f"{case}_{self.suffix}.log", "w")
+        log_file.write(message)
+
+    def close(self):
+        for log_file in self.files.values():
+            log_file.close()
+        self.files.clear()
+
+@pytest.fixture(scope="session")
+def case_file_logger(test_logger: lg.Logger):
+    """Configures the per-case info/debug/trace log files once for the whole session.
+
+    The files are only written when PLSQL_TEST_KEEP_LOGS is set; otherwise the parse tests
+    log to stderr alone. Messages are routed to a case's files while inside
+    `test_logger.contextualize(case=...)`. Under pytest-xdist (e.g. `-n auto`) each worker
+    writes to its own `TEST_LOGS_DIR/{worker_id}/`.
+    """
+    test_logger.remove() # Remove any default handlers
+    test_logger.add(
+        sys.stderr,
+        level="INFO", # Set to TRACE to see all logs during tests
+        colorize=True,
+        format="<green>{time:HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+    )
+
+    if not os.environ.get("PLSQL_TEST_KEEP_LOGS"):
+        yield test_logger
+        return
+
+    has_case = lambda record: "case" in record["extra"]
+    logs_dir = TEST_LOGS_DIR / os.environ.get("PYTEST_XDIST_WORKER", "master")
+    logs_dir.mkdir(parents=True, exist_ok=True)
+    sinks = [_CaseLogFiles(logs_dir, "info"), _CaseLogFiles(logs_dir, "debug"), _CaseLogFiles(logs_dir, "trace")]
+    handler_ids = [
+        test_logger.add(sinks[0], level="INFO", format=CASE_LOG_FORMAT, filter=has_case, backtrace=False, diagnose=False),
+        test_logger.add(sinks[1], level="DEBUG", format=CASE_LOG_FORMAT, filter=has_case, backtrace=False, diagnose=False),
+        test_logger.add(sinks[2], level="TRACE", format=CASE_TRACE_LOG_FORMAT, filter=has_case, backtrace=False, diagnose=False),
+    ]
+
+    yield test_logger
+
+    # --- Remove the file handlers to clean up ---
+    for handler_id in handler_ids:
+        test_logger.remove(handler_id)
+    for sink in sinks:
+        sink.close()
+
+def test_parse_method_with_real_files(case_file_logger:lg.Logger, sql_file_path, expected_json_file_name):
 
     sql_file_name = sql_file_path[-1]
     sql_file_path = Path(STRUCTURAL_PARSER_TEST_DATA_DIR, "input", *sql_file_path)
@@ -570,78 +695,23 @@ def test_parse_method_with_real_files(test_logger:lg.Logger, sql_file_path, expe
     assert sql_file_path.is_file(), f"Test SQL file not found: {sql_file_path}"
     assert expected_json_path.is_file(), f"Expected JSON output file not found: {expected_json_path}"
 
-    sql_content = sql_file_path.read_text()
-
-    # --- Configure File Logging for this specific test case ---
-    log_file_base_name = Path(sql_file_name).stem # e.g., "my_package_example"
-    
-    info_log_path = TEST_LOGS_DIR / f"{log_file_base_name}_info.log"
-    debug_log_path = TEST_LOGS_DIR / f"{log_file_base_name}_debug.log"
-    trace_log_path = TEST_LOGS_DIR / f"{log_file_base_name}_trace.log"
-
-    # Delete Log files, if already present
-    if info_log_path.exists():
-        info_log_path.unlink()
-    if debug_log_path.exists():
-        debug_log_path.unlink()
-    if trace_log_path.exists():
-        trace_log_path.unlink()
-
-
-    # Add file handlers. It's good practice to store their IDs to remove them later.
-    # Use a fresh logger instance or ensure the passed 'test_logger' can be configured per test.
-    # If 'test_logger' is session-scoped and shared, adding/removing handlers might affect other tests
-    # if not managed carefully. For per-test logs, creating a new logger instance or
-    # cloning/reconfiguring the existing one for the scope of this test is safer.
-
-    # For simplicity, let's assume test_logger can have handlers added and removed.
-    # If test_logger is from a fixture that already has handlers, you might want to
-    # create a new logger instance here or use logger.bind() to create a child logger.
-
-    # Let's clear any existing handlers from the test_logger for this specific test run
-    # to avoid duplicate messages if the fixture is reused.
-    # This depends on how your 'test_logger' fixture is set up.
-    # If it's a fresh logger each time, this might not be needed.
-    # For a session-scoped logger, this is important.
-    # test_logger.remove() # Potentially remove all handlers if you want full control here
+    sql_content = _read_text(str(sql_file_path))
 
-    test_logger.remove() # Remove any default handlers
-    test_logger.add(
-        sys.stderr,
-        level="INFO", # Set to TRACE to see all logs during tests
-        colorize=True,
-        format="<green>{time:HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
-    )
+    # Log files for this case are named after the SQL file, e.g., "my_package_example_info.log"
+    log_file_base_name = Path(sql_file_name).stem
 
-    handler_id_info = test_logger.add(
-        info_log_path, 
-        level="INFO",
-        format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} - {message}"
-    )
-    handler_id_debug = test_logger.add(
-        debug_log_path, 
-        level="DEBUG",
-        format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {name}:{function}:{line} - {message}"
-    )
-    handler_id_trace = test_logger.add(
-        trace_log_path, 
-        level="TRACE",
-        format="{time:YYYY-MM-DD HH:mm:ss.SSS} | {level: <8} | {extra[parser_type]} | {name}:{function}:{line} - {message}"
-    )
+    with case_file_logger.contextualize(case=log_file_base_name):
+        # Initialize the parser
+        # Use a low verbose_lvl for tests to avoid progress bar output unless debugging
+        parser = PlSqlStructuralParser(logger=case_file_logger, verbose_lvl=0)
 
-    
-    # Initialize the parser
-    # Use a low verbose_lvl for tests to avoid progress bar output unless debugging
-    parser = PlSqlStructuralParser(logger=test_logger, verbose_lvl=0) 
-    
-    try:
-        test_logger.info(f"Starting parse test for {sql_file_name}")
+        case_file_logger.info(f"Starting parse test for {sql_file_name}")
         # Call the parse method
-        clean_code, _ = clean_code_and_map_literals(sql_content, test_logger)
+        clean_code, _ = clean_code_and_map_literals(sql_content, case_file_logger)
         actual_package_name, actual_collected_objects = parser.parse(code=clean_code)
 
         # Load expected results from JSON
-        expected_data:dict = json.loads(expected_json_path.read_text())
+        expected_data:dict = _read_json(str(expected_json_path))
         expected_package_name = expected_data.get("package_name")
         expected_collected_objects = expected_data.get("collected_code_objects", {})
 
@@ -651,10 +721,4 @@ def test_parse_method_with_real_files(test_logger:lg.Logger, sql_file_path, expe
         assert actual_collected_objects == expected_collected_objects, \
             f"Collected code objects mismatch for {sql_file_path}"
 
-        test_logger.info(f"Successfully completed parse test for {sql_file_name}")
-
-    finally:
-        # --- Remove the file handlers to clean up ---
-        test_logger.remove(handler_id_info)
-        test_logger.remove(handler_id_debug)
-        test_logger.remove(handler_id_trace)
+        case_file_logger.info(f"Successfully completed parse test for {sql_file_name}")
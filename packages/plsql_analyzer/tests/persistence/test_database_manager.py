@@ -1,5 +1,8 @@
+import logging
 import pytest
 import sqlite3
+import uuid
+from contextlib import closing
 from pathlib import Path
 from datetime import datetime, timezone
 from enum import Enum
@@ -32,10 +35,8 @@ class MockPLSQLCodeObject:
         self._data.setdefault("declarations", [])
         self._data.setdefault("body", "")
         self._data.setdefault("dependencies", [])
-
-
-    def to_dict(self) -> Dict[str, Any]:
-        return {
+        # Attributes are never mutated after construction, so build the dict once
+        self._dict = {
             "id": self.id,
             "name": self.name,
             "type": self.type.value, # Use enum value
@@ -47,17 +48,101 @@ class MockPLSQLCodeObject:
             # Add other fields that the actual PLSQL_CodeObject.to_dict() might return
         }
 
-@pytest.fixture
-def db_manager(temp_db_path: Path, test_logger):
-    """Fixture to provide a DatabaseManager instance with a temporary DB path."""
-    return DatabaseManager(db_path=temp_db_path, logger=test_logger)
 
-@pytest.fixture
+    def to_dict(self) -> Dict[str, Any]:
+        return self._dict
+
+@pytest.fixture(scope="module")
+def memory_db_path():
+    """URI of a shared-cache in-memory SQLite database, kept alive for the whole module."""
+    db_path = f"file:plsql_test_{uuid.uuid4().hex}?mode=memory&cache=shared"
+    # The database only lives while a connection to it is open, so hold one across the
+    # DatabaseManager's short-lived _connect() connections
+    with closing(sqlite3.connect(db_path, uri=True)):
+        yield db_path
+
+@pytest.fixture(scope="module")
+def db_manager(memory_db_path: str, test_logger):
+    """Fixture to provide a DatabaseManager instance on an in-memory DB, shared by the module."""
+    return DatabaseManager(db_path=memory_db_path, logger=test_logger, uri=True)
+
+@pytest.fixture(scope="module")
 def initialized_db_manager(db_manager: DatabaseManager):
-    """Fixture to provide a DatabaseManager instance with the database schema set up."""
+    """Fixture to provide a DatabaseManager instance with the database schema set up.
+
+    The schema is created once per module; `_clean_db` empties the tables after every test.
+    """
     db_manager.setup_database()
     return db_manager
 
+@pytest.fixture
+def file_db_manager(temp_db_path: Path, test_logger):
+    """Fixture to provide an initialized DatabaseManager on an on-disk DB.
+
+    Needed where a second connection must see only committed data: in a shared-cache
+    in-memory DB that connection would hit "table is locked" instead.
+    """
+    db_manager = DatabaseManager(db_path=temp_db_path, logger=test_logger)
+    db_manager.setup_database()
+    yield db_manager
+    if db_manager._batch_conn is not None:
+        db_manager.commit_batch()
+
+@pytest.fixture
+def db_conn(initialized_db_manager: DatabaseManager):
+    """One raw connection (with the manager's PRAGMAs and converters) for a test's direct queries."""
+    with closing(initialized_db_manager._connect()) as conn:
+        yield conn
+
+@pytest.fixture(autouse=True)
+def _clean_db(request: pytest.FixtureRequest):
+    """Empties the shared database after each test that used it."""
+    yield
+    if "initialized_db_manager" not in request.fixturenames:
+        return
+
+    db_manager: DatabaseManager = request.getfixturevalue("initialized_db_manager")
+    if db_manager._batch_conn is not None: # Left open by a failing batch test
+        db_manager.commit_batch()
+    with closing(db_manager._connect()) as conn:
+        conn.executescript("DELETE FROM Extracted_PLSQL_CodeObjects; DELETE FROM Processed_PLSQL_Files;")
+
+@pytest.fixture
+def caplog(caplog: pytest.LogCaptureFixture):
+    """Only buffers records emitted by the module under test."""
+    # The capture handler is shared by the whole session, so the filter must not outlive the test
+    module_filter = logging.Filter(DatabaseManager.__module__)
+    caplog.handler.addFilter(module_filter)
+    yield caplog
+    caplog.handler.removeFilter(module_filter)
+
+def _has_log(caplog: pytest.LogCaptureFixture, needle: str) -> bool:
+    """Checks the captured messages one record at a time instead of rebuilding `caplog.text`."""
+    return any(needle in record.getMessage() for record in caplog.records)
+
+def _bulk_add(db_manager: DatabaseManager, pairs: list[tuple[MockPLSQLCodeObject, str]]):
+    """Seeds (code object, file path) pairs in a single batch, i.e. one commit for all of them."""
+    db_manager.begin_batch()
+    try:
+        for code_obj, fpath in pairs:
+            assert db_manager.add_codeobject(code_obj, fpath) is True
+    finally:
+        db_manager.commit_batch()
+
+SEEDED_FILE_HASH = "seeded_hash"
+
+@pytest.fixture
+def seeded_db(initialized_db_manager: DatabaseManager):
+    """One processed file with two code objects, returned as (db_manager, obj1, obj2, fpath)."""
+    fpath = "seeded_file.sql"
+    assert initialized_db_manager.update_file_hash(fpath, SEEDED_FILE_HASH) is True
+
+    obj1 = MockPLSQLCodeObject(id="seed_obj1", name="SeedObj1", obj_type=MockObjectType.PROCEDURE)
+    obj2 = MockPLSQLCodeObject(id="seed_obj2", name="SeedObj2", obj_type=MockObjectType.FUNCTION, package_name="MyPkg")
+    _bulk_add(initialized_db_manager, [(obj1, fpath), (obj2, fpath)])
+
+    return initialized_db_manager, obj1, obj2, fpath
+
 def test_database_manager_init_ensures_dir_exists(temp_db_path: Path, test_logger, caplog):
     """Test that initializing DatabaseManager creates the database directory."""
     db_parent_dir = temp_db_path.parent
@@ -74,12 +159,12 @@ def test_database_manager_init_ensures_dir_exists(temp_db_path: Path, test_logge
 
     DatabaseManager(db_path=temp_db_path, logger=test_logger)
     assert db_parent_dir.exists(), "Database directory was not created"
-    assert f"Ensured database directory exists: {db_parent_dir}" in caplog.text
+    assert _has_log(caplog, f"Ensured database directory exists: {db_parent_dir}")
 
 def test_setup_database_creates_schema(initialized_db_manager: DatabaseManager):
     """Test that setup_database creates the necessary tables and indexes."""
     db_path = initialized_db_manager.db_path
-    with sqlite3.connect(db_path) as conn:
+    with sqlite3.connect(db_path, uri=initialized_db_manager.uri) as conn:
         cursor = conn.cursor()
         
         # Check for Processed_PLSQL_Files table
@@ -120,25 +205,23 @@ def test_datetime_adapter_converter():
     converted_dt_naive = convert_datetime(iso_naive.encode('utf-8'))
     assert converted_dt_naive == dt_naive
 
-def test_datetime_storage_and_retrieval(initialized_db_manager: DatabaseManager):
+def test_datetime_storage_and_retrieval(initialized_db_manager: DatabaseManager, db_conn: sqlite3.Connection):
     """Test that datetime objects are stored and retrieved correctly."""
     fpath = "test_dt_file.sql"
     file_hash = "dt_hash"
-    now_utc = datetime.now(timezone.utc)
 
     # Use update_file_hash as it stores a datetime
+    before = datetime.now(timezone.utc)
     initialized_db_manager.update_file_hash(fpath, file_hash)
+    after = datetime.now(timezone.utc)
 
-    with initialized_db_manager._connect() as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT last_processed_ts FROM Processed_PLSQL_Files WHERE file_path = ?", (fpath,))
-        row = cursor.fetchone()
-        assert row is not None
-        retrieved_ts = row["last_processed_ts"]
-        assert isinstance(retrieved_ts, datetime)
-        assert retrieved_ts.tzinfo == timezone.utc
-        # Allow for slight difference due to DB write/read and precision
-        assert abs((retrieved_ts - now_utc).total_seconds()) < 1 
+    row = db_conn.execute("SELECT last_processed_ts FROM Processed_PLSQL_Files WHERE file_path = ?", (fpath,)).fetchone()
+    assert row is not None
+    retrieved_ts = row["last_processed_ts"]
+    assert isinstance(retrieved_ts, datetime)
+    assert retrieved_ts.tzinfo == timezone.utc
+    # ISO 8601 keeps microseconds, so the round-tripped value must fall inside the call
+    assert before <= retrieved_ts <= after
 
 def test_update_and_get_file_hash(initialized_db_manager: DatabaseManager, caplog):
     """Test updating and retrieving file hashes."""
@@ -148,12 +231,12 @@ def test_update_and_get_file_hash(initialized_db_manager: DatabaseManager, caplo
 
     # Test get_file_hash for non-existent file
     assert initialized_db_manager.get_file_hash(fpath) is None
-    assert f"No stored hash found for: {fpath}" in caplog.text
+    assert _has_log(caplog, f"No stored hash found for: {fpath}")
 
     # Test update_file_hash for a new file
     caplog.clear()
     assert initialized_db_manager.update_file_hash(fpath, hash1) is True
-    assert f"Inserted/Replaced hash record for {fpath}" in caplog.text
+    assert _has_log(caplog, f"Inserted/Replaced hash record for {fpath}")
     
     stored_hash1 = initialized_db_manager.get_file_hash(fpath)
     assert stored_hash1 == hash1
@@ -171,7 +254,7 @@ def test_update_and_get_file_hash(initialized_db_manager: DatabaseManager, caplo
     # For robustness, we can check it's at least the same or newer.
     caplog.clear()
     assert initialized_db_manager.update_file_hash(fpath, hash2) is True
-    assert f"Inserted/Replaced hash record for {fpath}" in caplog.text
+    assert _has_log(caplog, f"Inserted/Replaced hash record for {fpath}")
 
     stored_hash2 = initialized_db_manager.get_file_hash(fpath)
     assert stored_hash2 == hash2
@@ -183,7 +266,7 @@ def test_update_and_get_file_hash(initialized_db_manager: DatabaseManager, caplo
         assert isinstance(ts2, datetime)
         assert ts2 >= ts1 # Timestamp should be updated or same if operations are very fast
 
-def test_add_and_get_all_codeobjects(initialized_db_manager: DatabaseManager, caplog):
+def test_add_and_get_all_codeobjects(initialized_db_manager: DatabaseManager, db_conn: sqlite3.Connection, caplog):
     """Test adding and retrieving code objects."""
     fpath1 = "file1.sql"
     fpath2 = "file2.sql"
@@ -197,16 +280,17 @@ def test_add_and_get_all_codeobjects(initialized_db_manager: DatabaseManager, ca
     obj2 = MockPLSQLCodeObject(id="func1", name="Func1", obj_type=MockObjectType.FUNCTION, data=obj2_data)
 
     assert initialized_db_manager.add_codeobject(obj1, fpath1) is True
-    assert f"Inserted/Replaced Pkg1.Proc1 (ID: {obj1.id}) for {fpath1}" in caplog.text
+    assert _has_log(caplog, f"Inserted/Replaced Pkg1.Proc1 (ID: {obj1.id}) for {fpath1}")
     caplog.clear()
     assert initialized_db_manager.add_codeobject(obj2, fpath2) is True
-    assert f"Inserted/Replaced Func1 (ID: {obj2.id}) for {fpath2}" in caplog.text
+    assert _has_log(caplog, f"Inserted/Replaced Func1 (ID: {obj2.id}) for {fpath2}")
 
     retrieved_objects = initialized_db_manager.get_all_codeobjects()
     assert len(retrieved_objects) == 2
 
-    retrieved_obj1_dict = next((o for o in retrieved_objects if o["id"] == obj1.id), None)
-    retrieved_obj2_dict = next((o for o in retrieved_objects if o["id"] == obj2.id), None)
+    by_id = {o["id"]: o for o in retrieved_objects}
+    retrieved_obj1_dict = by_id.get(obj1.id)
+    retrieved_obj2_dict = by_id.get(obj2.id)
 
     assert retrieved_obj1_dict is not None
     assert retrieved_obj2_dict is not None
@@ -220,20 +304,15 @@ def test_add_and_get_all_codeobjects(initialized_db_manager: DatabaseManager, ca
 
     # Verify original data from to_dict()
     expected_obj1_dict = obj1.to_dict()
-    for k, v in expected_obj1_dict.items():
-        assert retrieved_obj1_dict[k] == v
+    assert {k: retrieved_obj1_dict[k] for k in expected_obj1_dict} == expected_obj1_dict
     
     expected_obj2_dict = obj2.to_dict()
-    for k, v in expected_obj2_dict.items():
-        assert retrieved_obj2_dict[k] == v
+    assert {k: retrieved_obj2_dict[k] for k in expected_obj2_dict} == expected_obj2_dict
     
     # Check processing_ts was set
-    with initialized_db_manager._connect() as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT processing_ts FROM Extracted_PLSQL_CodeObjects WHERE id = ?", (obj1.id,))
-        ts = cursor.fetchone()["processing_ts"]
-        assert isinstance(ts, datetime)
-        assert ts.tzinfo == timezone.utc
+    ts = db_conn.execute("SELECT processing_ts FROM Extracted_PLSQL_CodeObjects WHERE id = ?", (obj1.id,)).fetchone()["processing_ts"]
+    assert isinstance(ts, datetime)
+    assert ts.tzinfo == timezone.utc
 
 def test_add_codeobject_no_id_fails(initialized_db_manager: DatabaseManager, caplog):
     """Test that adding a code object with no ID fails and logs an error."""
@@ -243,7 +322,7 @@ def test_add_codeobject_no_id_fails(initialized_db_manager: DatabaseManager, cap
     code_obj_no_id = MockPLSQLCodeObject(id=None, name="NoIDProc", obj_type=MockObjectType.PROCEDURE)
     
     assert initialized_db_manager.add_codeobject(code_obj_no_id, fpath) is False
-    assert f"Code object {code_obj_no_id.name} has no ID. Cannot add to DB." in caplog.text
+    assert _has_log(caplog, f"Code object {code_obj_no_id.name} has no ID. Cannot add to DB.")
 
 def test_get_all_codeobjects_empty_db(initialized_db_manager: DatabaseManager):
     """Test retrieving code objects from an empty (but initialized) database."""
@@ -261,58 +340,43 @@ def test_update_file_hash_deletes_old_codeobjects(initialized_db_manager: Databa
     assert initialized_db_manager.add_codeobject(code_obj, fpath) is True
     
     # Verify object exists
-    objects = initialized_db_manager.get_all_codeobjects()
-    assert any(o["id"] == code_obj.id for o in objects)
+    object_ids = {o["id"] for o in initialized_db_manager.get_all_codeobjects()}
+    assert code_obj.id in object_ids
 
     # Update the hash for the same file
     caplog.clear()
     assert initialized_db_manager.update_file_hash(fpath, hash2) is True
-    assert f"Deleted old code objects for {fpath} before hash update." in caplog.text
+    assert _has_log(caplog, f"Deleted old code objects for {fpath} before hash update.")
     
     # Verify the old object is gone
-    objects_after_rehash = initialized_db_manager.get_all_codeobjects()
-    assert not any(o["id"] == code_obj.id for o in objects_after_rehash), \
+    object_ids_after_rehash = {o["id"] for o in initialized_db_manager.get_all_codeobjects()}
+    assert code_obj.id not in object_ids_after_rehash, \
         "Old code object was not deleted after file hash update"
 
-def test_foreign_key_cascade_delete_on_processed_file_deletion(initialized_db_manager: DatabaseManager):
+def test_foreign_key_cascade_delete_on_processed_file_deletion(seeded_db, db_conn: sqlite3.Connection):
     """
     Test that deleting a record from Processed_PLSQL_Files cascades
     and deletes associated records from Extracted_PLSQL_CodeObjects.
     """
-    fpath = "test_file_fk_cascade.sql"
-    file_hash = "fk_hash_cascade"
+    db_manager, code_obj1, code_obj2, fpath = seeded_db
 
-    initialized_db_manager.update_file_hash(fpath, file_hash)
-
-    code_obj1 = MockPLSQLCodeObject(id="fk_obj1", name="TestFK1", obj_type=MockObjectType.PROCEDURE)
-    code_obj2 = MockPLSQLCodeObject(id="fk_obj2", name="TestFK2", obj_type=MockObjectType.FUNCTION, package_name="MyPkg")
-    
-    assert initialized_db_manager.add_codeobject(code_obj1, fpath) is True
-    assert initialized_db_manager.add_codeobject(code_obj2, fpath) is True
+    count_sql = "SELECT COUNT(*) FROM Extracted_PLSQL_CodeObjects WHERE file_path = ?"
 
     # Verify objects exist
-    with initialized_db_manager._connect() as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM Extracted_PLSQL_CodeObjects WHERE file_path = ?", (fpath,))
-        assert cursor.fetchone()[0] == 2
+    assert db_conn.execute(count_sql, (fpath,)).fetchone()[0] == 2
 
     # Manually delete the record from Processed_PLSQL_Files
-    with initialized_db_manager._connect() as conn:
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM Processed_PLSQL_Files WHERE file_path = ?", (fpath,))
-        conn.commit()
-        assert cursor.rowcount == 1, "Processed_PLSQL_Files record not deleted"
+    cursor = db_conn.execute("DELETE FROM Processed_PLSQL_Files WHERE file_path = ?", (fpath,))
+    db_conn.commit()
+    assert cursor.rowcount == 1, "Processed_PLSQL_Files record not deleted"
 
     # Verify associated code objects are also deleted due to CASCADE
-    with initialized_db_manager._connect() as conn:
-        cursor = conn.cursor()
-        cursor.execute("SELECT COUNT(*) FROM Extracted_PLSQL_CodeObjects WHERE file_path = ?", (fpath,))
-        assert cursor.fetchone()[0] == 0, "Code objects not deleted by cascade rule"
+    assert db_conn.execute(count_sql, (fpath,)).fetchone()[0] == 0, "Code objects not deleted by cascade rule"
 
     # Also check via the manager's method
-    all_objects = initialized_db_manager.get_all_codeobjects()
-    assert not any(o["id"] == code_obj1.id for o in all_objects)
-    assert not any(o["id"] == code_obj2.id for o in all_objects)
+    all_object_ids = {o["id"] for o in db_manager.get_all_codeobjects()}
+    assert code_obj1.id not in all_object_ids
+    assert code_obj2.id not in all_object_ids
 
 def test_add_codeobject_replace(initialized_db_manager: DatabaseManager):
     """Test that adding a code object with an existing ID replaces the old one."""
@@ -340,45 +404,35 @@ def test_add_codeobject_replace(initialized_db_manager: DatabaseManager):
     assert retrieved_v2[0]["declarations"] == obj_v2_data["declarations"] # Data should be updated
     assert retrieved_v2[0]["name"] == obj_v2.name # Other fields should also reflect v2 if changed
 
-def test_remove_file_record_success(initialized_db_manager: DatabaseManager, caplog):
+def test_remove_file_record_success(seeded_db, caplog):
     """Test successfully removing a file record and its associated code objects."""
-    fpath = "test_file_to_remove.sql"
-    file_hash = "hash_to_remove"
-
-    # Add a file record
-    assert initialized_db_manager.update_file_hash(fpath, file_hash) is True
-
-    # Add associated code objects
-    obj1 = MockPLSQLCodeObject(id="rem_obj1", name="RemoveObj1", obj_type=MockObjectType.PROCEDURE)
-    obj2 = MockPLSQLCodeObject(id="rem_obj2", name="RemoveObj2", obj_type=MockObjectType.FUNCTION)
-    assert initialized_db_manager.add_codeobject(obj1, fpath) is True
-    assert initialized_db_manager.add_codeobject(obj2, fpath) is True
+    db_manager, obj1, obj2, fpath = seeded_db
 
     # Verify file and objects exist
-    assert initialized_db_manager.get_file_hash(fpath) == file_hash
-    all_objects = initialized_db_manager.get_all_codeobjects()
-    assert any(o["id"] == obj1.id for o in all_objects)
-    assert any(o["id"] == obj2.id for o in all_objects)
+    assert db_manager.get_file_hash(fpath) == SEEDED_FILE_HASH
+    all_object_ids = {o["id"] for o in db_manager.get_all_codeobjects()}
+    assert obj1.id in all_object_ids
+    assert obj2.id in all_object_ids
     
-    with initialized_db_manager._connect() as conn:
+    with db_manager._connect() as conn:
         cursor = conn.cursor()
         cursor.execute("SELECT COUNT(*) FROM Extracted_PLSQL_CodeObjects WHERE file_path = ?", (fpath,))
         assert cursor.fetchone()[0] == 2
 
     caplog.clear()
     # Remove the file record
-    assert initialized_db_manager.remove_file_record(fpath) is True
-    assert f"Successfully removed file record and associated code objects for {fpath}" in caplog.text
+    assert db_manager.remove_file_record(fpath) is True
+    assert _has_log(caplog, f"Successfully removed file record and associated code objects for {fpath}")
 
     # Verify file record is removed
-    assert initialized_db_manager.get_file_hash(fpath) is None
+    assert db_manager.get_file_hash(fpath) is None
 
     # Verify associated code objects are removed (due to ON DELETE CASCADE)
-    all_objects_after_remove = initialized_db_manager.get_all_codeobjects()
-    assert not any(o["id"] == obj1.id for o in all_objects_after_remove)
-    assert not any(o["id"] == obj2.id for o in all_objects_after_remove)
+    object_ids_after_remove = {o["id"] for o in db_manager.get_all_codeobjects()}
+    assert obj1.id not in object_ids_after_remove
+    assert obj2.id not in object_ids_after_remove
 
-    with initialized_db_manager._connect() as conn:
+    with db_manager._connect() as conn:
         cursor = conn.cursor()
         cursor.execute("SELECT COUNT(*) FROM Extracted_PLSQL_CodeObjects WHERE file_path = ?", (fpath,))
         assert cursor.fetchone()[0] == 0, "Code objects were not deleted after removing file record"
@@ -389,7 +443,7 @@ def test_remove_file_record_non_existent(initialized_db_manager: DatabaseManager
 
     caplog.clear()
     assert initialized_db_manager.remove_file_record(fpath_non_existent) is True
-    assert f"No file record found for {fpath_non_existent} to remove. Considered successful as record is not present." in caplog.text
+    assert _has_log(caplog, f"No file record found for {fpath_non_existent} to remove. Considered successful as record is not present.")
 
     # Verify no side effects (e.g., other records deleted)
     fpath_existing = "existing_file.sql"
@@ -401,5 +455,70 @@ def test_remove_file_record_non_existent(initialized_db_manager: DatabaseManager
     initialized_db_manager.remove_file_record(fpath_non_existent) # Call again to ensure no impact
 
     assert initialized_db_manager.get_file_hash(fpath_existing) == hash_existing
-    all_objects = initialized_db_manager.get_all_codeobjects()
-    assert any(o["id"] == obj_existing.id for o in all_objects)
+    assert obj_existing.id in {o["id"] for o in initialized_db_manager.get_all_codeobjects()}
+
+def _count_processed_files(db_path: Path) -> int:
+    """Counts committed file records using a connection independent of the manager."""
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM Processed_PLSQL_Files").fetchone()[0]
+
+def test_batch_defers_commits_until_threshold(file_db_manager: DatabaseManager):
+    """Test that writes inside a batch are committed every `commit_every` operations."""
+    file_db_manager.begin_batch(commit_every=3)
+
+    file_db_manager.update_file_hash("batch_1.sql", "hash_1")
+    file_db_manager.update_file_hash("batch_2.sql", "hash_2")
+
+    # Pending writes are visible through the manager but not committed yet
+    assert file_db_manager.get_file_hash("batch_2.sql") == "hash_2"
+    assert _count_processed_files(file_db_manager.db_path) == 0
+
+    # Third write reaches the threshold and flushes the batch
+    file_db_manager.update_file_hash("batch_3.sql", "hash_3")
+    assert _count_processed_files(file_db_manager.db_path) == 3
+
+    file_db_manager.update_file_hash("batch_4.sql", "hash_4")
+    assert _count_processed_files(file_db_manager.db_path) == 3
+
+    # Closing the batch commits the remainder
+    file_db_manager.commit_batch()
+    assert _count_processed_files(file_db_manager.db_path) == 4
+    assert file_db_manager.get_file_hash("batch_4.sql") == "hash_4"
+
+def test_batch_keeps_remove_and_add_semantics(initialized_db_manager: DatabaseManager):
+    """Test that code object writes and file removal behave the same inside a batch."""
+    fpath = "batched_file.sql"
+    initialized_db_manager.begin_batch()
+
+    assert initialized_db_manager.update_file_hash(fpath, "batched_hash") is True
+    obj = MockPLSQLCodeObject(id="batched_obj", name="BatchedObj", obj_type=MockObjectType.PROCEDURE)
+    assert initialized_db_manager.add_codeobject(obj, fpath) is True
+    assert [o["id"] for o in initialized_db_manager.get_all_codeobjects()] == [obj.id]
+
+    assert initialized_db_manager.remove_file_record(fpath) is True
+    assert initialized_db_manager.get_all_codeobjects() == []
+
+    initialized_db_manager.commit_batch()
+    assert initialized_db_manager.get_file_hash(fpath) is None
+
+def test_batch_rolls_back_failed_write_only(initialized_db_manager: DatabaseManager):
+    """Test that a write failing inside a batch is undone while the batch's other writes are kept."""
+    fpath = "batch_failed_write.sql"
+    assert initialized_db_manager.update_file_hash(fpath, "h1") is True
+    obj = MockPLSQLCodeObject(id="batch_kept_obj", name="KeptObj", obj_type=MockObjectType.PROCEDURE)
+    assert initialized_db_manager.add_codeobject(obj, fpath) is True
+
+    initialized_db_manager.begin_batch()
+    assert initialized_db_manager.update_file_hash("batch_ok.sql", "ok_hash") is True
+    # NOT NULL violation on file_hash, after the write has already deleted the file's code objects
+    assert initialized_db_manager.update_file_hash(fpath, None) is False
+    initialized_db_manager.commit_batch()
+
+    assert initialized_db_manager.get_file_hash(fpath) == "h1"
+    assert [o["id"] for o in initialized_db_manager.get_all_codeobjects()] == [obj.id]
+    assert initialized_db_manager.get_file_hash("batch_ok.sql") == "ok_hash"
+
+def test_commit_batch_without_open_batch_warns(initialized_db_manager: DatabaseManager, caplog):
+    """Test that committing without an open batch is a logged no-op."""
+    initialized_db_manager.commit_batch()
+    assert _has_log(caplog, "No database batch is open. Ignoring commit_batch call.")
@@ -1,16 +1,30 @@
-import tempfile
+import pytest
 from pathlib import Path
 from plsql_analyzer.settings import PLSQLAnalyzerSettings
 
-def test_default_instantiation():
-    config = PLSQLAnalyzerSettings(source_code_root_dir="/tmp")
+# The settings add the current directory's parts to both exclusion lists; resolve them once
+_CWD_PARTS = list(Path.cwd().resolve().parts)
+_PACKAGE_DERIVATION_DEFAULTS = ["PROCEDURES", "PACKAGE_BODIES", "FUNCTIONS"]
+# Sorted exclusion lists expected from default settings
+_DEFAULT_PROCESSED_PATH_EXCLUSIONS = sorted(_CWD_PARTS)
+_DEFAULT_PACKAGE_DERIVATION_EXCLUSIONS = sorted(_PACKAGE_DERIVATION_DEFAULTS + _CWD_PARTS)
+# Expected prefix of "~/../" once expanded
+_HOME_PARENT_STR = str(Path.home().parent)
+
+@pytest.fixture(scope="module")
+def default_settings() -> PLSQLAnalyzerSettings:
+    """One settings instance built from defaults, shared by the tests that only read it."""
+    return PLSQLAnalyzerSettings(source_code_root_dir="/tmp")
+
+def test_default_instantiation(default_settings: PLSQLAnalyzerSettings):
+    config = default_settings
     assert config.source_code_root_dir == Path("/tmp").resolve()
     assert config.output_base_dir == Path("generated/artifacts").resolve()
     assert config.log_verbose_level == 1
     assert config.database_filename == "PLSQL_CodeObjects.db"
     assert config.file_extensions_to_include == ["sql"]
-    assert sorted(config.exclude_names_from_processed_path) == sorted(list(Path.cwd().resolve().parts))
-    assert sorted(config.exclude_names_for_package_derivation) == sorted(["PROCEDURES", "PACKAGE_BODIES", "FUNCTIONS"] + list(Path.cwd().resolve().parts))
+    assert sorted(config.exclude_names_from_processed_path) == _DEFAULT_PROCESSED_PATH_EXCLUSIONS
+    assert sorted(config.exclude_names_for_package_derivation) == _DEFAULT_PACKAGE_DERIVATION_EXCLUSIONS
     assert config.enable_profiler is False
 
 def test_override_values():
@@ -28,8 +42,8 @@ def test_override_values():
     assert config.log_verbose_level == 2
     assert config.database_filename == "test.db"
     assert config.file_extensions_to_include == ["foo"]
-    assert sorted(config.exclude_names_from_processed_path) == sorted(["bar"] + list(Path.cwd().resolve().parts))
-    assert sorted(config.exclude_names_for_package_derivation) == sorted(["PROCEDURES", "PACKAGE_BODIES", "FUNCTIONS"] + ["bar"] + list(Path.cwd().resolve().parts))
+    assert sorted(config.exclude_names_from_processed_path) == sorted(["bar"] + _CWD_PARTS)
+    assert sorted(config.exclude_names_for_package_derivation) == sorted(_PACKAGE_DERIVATION_DEFAULTS + ["bar"] + _CWD_PARTS)
     assert config.enable_profiler is True
 
 def test_derived_properties():
@@ -38,14 +52,13 @@ def test_derived_properties():
     assert config.logs_dir == Path("/tmp/out/logs/plsql_analyzer").resolve()
     assert config.database_path == Path("/tmp/out/foo.db").resolve()
 
-def test_ensure_artifact_dirs():
-    with tempfile.TemporaryDirectory() as tmpdir:
-        config = PLSQLAnalyzerSettings(source_code_root_dir=tmpdir, output_base_dir=tmpdir)
-        logs_dir = config.logs_dir
-        assert not logs_dir.exists()
-        config.ensure_artifact_dirs()
-        assert config.artifacts_dir.exists()
-        assert config.logs_dir.exists()
+def test_ensure_artifact_dirs(tmp_path):
+    config = PLSQLAnalyzerSettings(source_code_root_dir=tmp_path, output_base_dir=tmp_path)
+    logs_dir = config.logs_dir
+    assert not logs_dir.exists()
+    config.ensure_artifact_dirs()
+    assert config.artifacts_dir.exists()
+    assert config.logs_dir.exists()
 
 def test_path_expansion(monkeypatch):
     monkeypatch.setenv("MY_TEST_DIR", "/tmp/mytest")
@@ -53,13 +66,13 @@ def test_path_expansion(monkeypatch):
         source_code_root_dir="~/../",  # Should expand user
         output_base_dir="$MY_TEST_DIR/subdir"  # Should expand env var
     )
-    assert str(config.source_code_root_dir).startswith(str(Path.home().parent))
+    assert str(config.source_code_root_dir).startswith(_HOME_PARENT_STR)
     assert config.output_base_dir == Path("/tmp/mytest/subdir").resolve()
 
-def test_call_analysis_settings():
+def test_call_analysis_settings(default_settings: PLSQLAnalyzerSettings):
     """Test call analysis related settings including the new strict_lpar_only_calls."""
     # Test default values
-    config = PLSQLAnalyzerSettings(source_code_root_dir="/tmp")
+    config = default_settings
     assert not config.allow_parameterless_calls
     assert not config.strict_lpar_only_calls
     
@@ -72,33 +85,25 @@ def test_call_analysis_settings():
     assert config_custom.allow_parameterless_calls
     assert config_custom.strict_lpar_only_calls
 
-def test_strict_lpar_only_calls_boolean_validation():
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (True, True),
+        (False, False),
+        # Pydantic coerces common boolean representations instead of raising
+        ("true", True),
+        ("false", False),
+        (1, True),
+        (0, False),
+    ],
+)
+def test_strict_lpar_only_calls_boolean_validation(value, expected):
     """Test that strict_lpar_only_calls accepts boolean values and type coercion."""
-    # Valid boolean values
-    config_true = PLSQLAnalyzerSettings(source_code_root_dir="/tmp", strict_lpar_only_calls=True)
-    assert config_true.strict_lpar_only_calls
-    
-    config_false = PLSQLAnalyzerSettings(source_code_root_dir="/tmp", strict_lpar_only_calls=False)
-    assert not config_false.strict_lpar_only_calls
-    
-    # Test that Pydantic performs type coercion for common boolean representations
-    # These should be coerced to boolean values, not raise errors
-    config_str_true = PLSQLAnalyzerSettings(source_code_root_dir="/tmp", strict_lpar_only_calls="true")
-    assert config_str_true.strict_lpar_only_calls
-    
-    config_str_false = PLSQLAnalyzerSettings(source_code_root_dir="/tmp", strict_lpar_only_calls="false")
-    assert not config_str_false.strict_lpar_only_calls
-    
-    config_int_true = PLSQLAnalyzerSettings(source_code_root_dir="/tmp", strict_lpar_only_calls=1)
-    assert config_int_true.strict_lpar_only_calls
-    
-    config_int_false = PLSQLAnalyzerSettings(source_code_root_dir="/tmp", strict_lpar_only_calls=0)
-    assert not config_int_false.strict_lpar_only_calls
+    config = PLSQLAnalyzerSettings(source_code_root_dir="/tmp", strict_lpar_only_calls=value)
+    assert config.strict_lpar_only_calls is expected
 
 def test_settings_field_descriptions():
     """Test that the new setting has proper field description."""
-    from plsql_analyzer.settings import PLSQLAnalyzerSettings
-    
     # Get field info from the Pydantic model
     fields = PLSQLAnalyzerSettings.model_fields
     
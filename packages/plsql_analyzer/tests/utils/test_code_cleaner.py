@@ -2,23 +2,32 @@
 Tests for the code_cleaner.py utility module.
 """
 from __future__ import annotations
+import os
 import sys
 import pytest
 import loguru as lg
 
-from plsql_analyzer.utils.code_cleaner import clean_code_and_map_literals
+from plsql_analyzer.utils.code_cleaner import clean_code_and_map_literals, clear_cleaning_cache, _scan_code
 
-# Set up logger for tests
 logger = lg.logger
-logger.remove()
-logger.add(
-    sink=sys.stderr,
-    level="TRACE",
-    colorize=True,
-    format="<green>{time:HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
-)
 
-@pytest.fixture
+@pytest.fixture(scope="module", autouse=True)
+def _module_log_sink():
+    """
+    Installs this module's stderr sink once, when its first test runs, instead of at import.
+    It logs at WARNING unless PLSQL_TEST_TRACE=1 is set, and colors only a terminal.
+    """
+    logger.remove()
+    handler_id = logger.add(
+        sink=sys.stderr,
+        level="TRACE" if os.environ.get("PLSQL_TEST_TRACE") else "WARNING",
+        colorize=sys.stderr.isatty(),
+        format="<green>{time:HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+    )
+    yield
+    logger.remove(handler_id)
+
+@pytest.fixture(scope="module")
 def test_logger() -> lg.Logger:
     """Return a logger instance for tests."""
     return logger
@@ -157,3 +166,78 @@ def test_q_quoted_strings_not_specially_handled(test_logger):
     cleaned_code_2, mapping_2 = clean_code_and_map_literals(code_2, test_logger)
     assert cleaned_code_2 == expected_cleaned_code_2
     assert mapping_2 == expected_mapping_2
+
+@pytest.mark.parametrize("code", [
+    "a := b + c;",
+    "BEGIN\n  my_proc(1, 2);\nEND;",
+    "x := y / z * 2 - 1;", # Lone '/', '*' and '-' are not comment markers
+    "",
+], ids=["assignment", "block", "operators", "empty"])
+def test_clean_code_fast_path_returns_input_unchanged(test_logger, code):
+    """Code without quotes or comment markers is returned as-is with an empty mapping."""
+    cleaned_code, mapping = clean_code_and_map_literals(code, test_logger)
+    assert cleaned_code is code
+    assert mapping == {}
+
+def test_clean_code_many_literals_placeholder_names(test_logger):
+    """Placeholder tags stay sequential past the precomputed tag cache."""
+    code = ", ".join(f"'v{i}'" for i in range(150))
+    cleaned_code, mapping = clean_code_and_map_literals(code, test_logger)
+    assert cleaned_code == ", ".join(f"'<LITERAL_{i}>'" for i in range(150))
+    assert mapping == {f"<LITERAL_{i}>": f"v{i}" for i in range(150)}
+
+@pytest.mark.parametrize("input_code, expected_cleaned_code, expected_mapping", [
+    ("x := 'abc", "x := '<LITERAL_0>", {"<LITERAL_0>": "abc"}),
+    ("x := 'it''s", "x := '<LITERAL_0>", {"<LITERAL_0>": "it''s"}),
+    ("x := 'a''''b' || ''", "x := '<LITERAL_0>' || '<LITERAL_1>'", {"<LITERAL_0>": "a''''b", "<LITERAL_1>": ""}),
+], ids=["unclosed", "unclosed_with_escape", "consecutive_escapes_and_empty"])
+def test_clean_code_literal_boundaries(test_logger, input_code, expected_cleaned_code, expected_mapping):
+    """Literal end detection with escaped quotes, empty and unterminated literals."""
+    cleaned_code, mapping = clean_code_and_map_literals(input_code, test_logger)
+    assert cleaned_code == expected_cleaned_code
+    assert mapping == expected_mapping
+
+def test_clean_code_cached_result_is_not_shared(test_logger):
+    """Repeated cleaning of the same code returns equal results without sharing the mapping."""
+    code = "my_proc('a', 'b'); -- note"
+    cleaned_code, mapping = clean_code_and_map_literals(code, test_logger)
+    mapping["<LITERAL_0>"] = "changed"
+    mapping["<LITERAL_9>"] = "extra"
+
+    cleaned_code_again, mapping_again = clean_code_and_map_literals(code, test_logger)
+    assert cleaned_code_again == cleaned_code
+    assert mapping_again == {"<LITERAL_0>": "a", "<LITERAL_1>": "b"}
+    assert mapping_again is not mapping
+
+@pytest.mark.parametrize("input_code, expected_cleaned_code", [
+    ("a /* x ** y **/ b", "a  b"),
+    ("a /*/ b */ c", "a  c"),
+    ("a /* never closed\n b(1);", "a "),
+    ("a /* " + "*" * 5000 + " b", "a "),
+], ids=["stars_inside", "slash_after_open", "unclosed", "long_unclosed_stars"])
+def test_clean_code_block_comment_boundaries(test_logger, input_code, expected_cleaned_code):
+    """Block comments end at the first `*/`, or run to the end of the code when unclosed."""
+    cleaned_code, mapping = clean_code_and_map_literals(input_code, test_logger)
+    assert cleaned_code == expected_cleaned_code
+    assert mapping == {}
+
+def test_clear_cleaning_cache(test_logger):
+    """Cleaning results are memoized per distinct code and can be dropped explicitly."""
+    clear_cleaning_cache()
+    code = "x := 'cached'; -- once"
+    first = clean_code_and_map_literals(code, test_logger)
+    second = clean_code_and_map_literals(code, test_logger)
+    assert first == second
+    assert _scan_code.cache_info().hits == 1
+    assert _scan_code.cache_info().currsize == 1
+
+    clear_cleaning_cache()
+    assert _scan_code.cache_info().currsize == 0
+    assert clean_code_and_map_literals(code, test_logger) == first
+
+def test_clean_without_cache(test_logger):
+    """Code cleaned with use_cache=False gives the same result and is not memoized."""
+    clear_cleaning_cache()
+    code = "x := 'whole file'; /* once */"
+    assert clean_code_and_map_literals(code, test_logger, use_cache=False) == ("x := '<LITERAL_0>'; ", {"<LITERAL_0>": "whole file"})
+    assert _scan_code.cache_info().currsize == 0
@@ -1,24 +1,26 @@
 # tests/utils/test_file_helpers.py
+import os
 import pytest
-from pathlib import Path
-from unittest.mock import patch, mock_open # For mocking file operations
+from pathlib import Path, PurePosixPath
+from unittest.mock import patch # For mocking file operations
 from plsql_analyzer.utils.file_helpers import FileHelpers
 
 class TestFileHelpers:
 
-    @pytest.fixture
+    @pytest.fixture(scope="class")
     def file_helpers_instance(self, test_logger) -> FileHelpers:
+        """FileHelpers holds no state besides its logger, so one instance serves the whole class."""
         return FileHelpers(logger=test_logger)
 
     def test_escape_angle_brackets(self, file_helpers_instance):
         assert file_helpers_instance.escape_angle_brackets("<a><b>") == "\\<a\\>\\<b\\>"
         assert file_helpers_instance.escape_angle_brackets("no brackets") == "no brackets"
 
-    @patch("pathlib.Path.is_file")
-    @patch("builtins.open", new_callable=mock_open, read_data=b"file content for hash")
-    def test_compute_file_hash_success(self, mock_file_open, mock_is_file, file_helpers_instance, tmp_path):
-        mock_is_file.return_value = True
+    # hashlib.file_digest needs a real binary file object, so spy on open() instead of mocking it
+    @patch("builtins.open", wraps=open)
+    def test_compute_file_hash_success(self, mock_file_open, file_helpers_instance, tmp_path):
         test_file = tmp_path / "test.sql" # Path object needed
+        test_file.write_bytes(b"file content for hash")
         
         # Expected sha256 hash for "file content for hash"
         expected_hash = "cdd92c6671dfba1a5e8f34378babe91032332959179f750a5f20c10a04679821"
@@ -33,12 +35,17 @@ class TestFileHelpers:
         test_file = tmp_path / "non_existent.sql"
         assert file_helpers_instance.compute_file_hash(test_file) is None
 
-    def test_compute_file_hash_invalid_algorithm(self, file_helpers_instance, tmp_path):
-        # This test needs a file that actually exists to get past the is_file check,
-        # or we mock is_file to True. Let's create a dummy file.
-        test_file = tmp_path / "dummy.txt"
+    @pytest.fixture(scope="class")
+    def dummy_file(self, tmp_path_factory) -> Path:
+        """A real file, written once for the class, to get past the is_file check."""
+        test_file = tmp_path_factory.mktemp("file_hash") / "dummy.txt"
         test_file.write_text("content")
-        assert file_helpers_instance.compute_file_hash(test_file, algorithm="invalid_algo") is None
+        return test_file
+
+    # "md4" itself is left out: whether it is available depends on the OpenSSL build
+    @pytest.mark.parametrize("algorithm", ["invalid_algo", "", "md4_not_available"])
+    def test_compute_file_hash_invalid_algorithm(self, file_helpers_instance, dummy_file, algorithm):
+        assert file_helpers_instance.compute_file_hash(dummy_file, algorithm=algorithm) is None
 
     # Tests for get_processed_fpath_str
     # These depend on Path.resolve() and Path.is_relative_to() which behave differently across OS
@@ -54,7 +61,7 @@ class TestFileHelpers:
     ])
     def test_get_processed_fpath(self, file_helpers_instance, fpath_str, exclusions, expected_str_posix):
         # Actual call
-        fpath = Path(*fpath_str.split('\\')) if "\\" in fpath_str else Path(*fpath_str.split('/'))
+        fpath = PurePosixPath(fpath_str.replace('\\', '/'))
         result = file_helpers_instance.get_processed_fpath(fpath, exclusions)
         assert result == Path(expected_str_posix)
 
@@ -72,7 +79,7 @@ class TestFileHelpers:
     ])
     def test_derive_package_name_from_path(self, file_helpers_instance, pkg_from_code, fpath_str, file_ext, exclude_from_pkg_derivation, expected_pkg_name, mocker):
         # We need to mock Path behavior for parts and parent traversal
-        mock_fpath = Path(*fpath_str.split('/')) # Use actual Path to test its traversal logic as much as possible
+        mock_fpath = PurePosixPath(fpath_str) # A real (pure) path, so its traversal logic is exercised as much as possible
 
         # Mocking Path constructor for the entire test if needed, or just parts used by function.
         # The function itself uses fpath.parent, current_dir.name, current_dir != current_dir.parent
@@ -81,4 +88,32 @@ class TestFileHelpers:
         result = file_helpers_instance.derive_package_name_from_path(
             pkg_from_code, mock_fpath, file_ext, exclude_from_pkg_derivation
         )
-        assert result == expected_pkg_name
\ No newline at end of file
+        assert result == expected_pkg_name
+
+    def test_walk_source_tree(self, file_helpers_instance, tmp_path):
+        (tmp_path / "pkg" / "nested").mkdir(parents=True)
+        (tmp_path / "top.sql").write_text("")
+        (tmp_path / "pkg" / "body.pkb").write_text("")
+        (tmp_path / "pkg" / "nested" / "deep.sql").write_text("")
+        (tmp_path / "pkg" / "notes.txt").write_text("")
+        (tmp_path / "dir.sql").mkdir() # Directories matching the extension are not yielded
+
+        result = file_helpers_instance.walk_source_tree(tmp_path, ["sql", "pkb"])
+
+        assert sorted(Path(p).relative_to(tmp_path).as_posix() for p in result) == [
+            "pkg/body.pkb", "pkg/nested/deep.sql", "top.sql"
+        ]
+
+    def test_walk_source_tree_extension_case(self, file_helpers_instance, tmp_path):
+        (tmp_path / "X.SQL").write_text("")
+        (tmp_path / "Proc.Sql").write_text("")
+        (tmp_path / "lower.sql").write_text("")
+
+        result = file_helpers_instance.walk_source_tree(tmp_path, ["sql"])
+
+        # Windows matches extensions case-insensitively (as rglob does there); other platforms do not
+        expected = ["Proc.Sql", "X.SQL", "lower.sql"] if os.name == "nt" else ["lower.sql"]
+        assert sorted(Path(p).name for p in result) == expected
+
+    def test_walk_source_tree_missing_root(self, file_helpers_instance, tmp_path):
+        assert list(file_helpers_instance.walk_source_tree(tmp_path / "missing", ["sql"])) == []